@@ -2,6 +2,19 @@
 Configuration package
 """
 
-from .settings import settings
+from typing import Any
+
+# Loading the submodule is cheap (it builds no Settings); drop the package attribute it binds, so that
+# `settings` here resolves through __getattr__ to the lazily created instance, as the eager re-export did
+from . import settings as _settings_module
+
+del settings
 
 __all__ = ["settings"]
+
+
+def __getattr__(name: str) -> Any:
+    # Defer Settings() construction until the settings object is first used
+    if name == "settings":
+        return _settings_module.settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
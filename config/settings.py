@@ -3,15 +3,151 @@ Configuration settings for the AI Text-to-Video Platform
 """
 
 import os
+import sys
+import copy
+import json
+import shutil
+import functools
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, Any, Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Set, Tuple, ClassVar, Final, Mapping
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as YamlLoader
 
-class Settings(BaseSettings):
-    """Application settings with environment variable support"""
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap nested dicts in read-only mapping proxies"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+# Static configuration tables. These are kept out of the Settings fields so
+# they are neither copied per Settings() nor scanned from env vars.
+
+# Supported languages
+SUPPORTED_LANGUAGES: Final[Mapping[str, str]] = _freeze({
+    "en": "English",
+    "hi": "Hindi"
+})
+
+# Voice configuration
+VOICE_CONFIGS: Final[Mapping[str, Mapping[str, Any]]] = _freeze({
+    "gtts": {
+        "en": {"tld": "com", "slow": False},
+        "hi": {"tld": "co.in", "slow": False}
+    },
+    "pyttsx3": {
+        "rate": 150,
+        "volume": 0.9
+    }
+})
+
+# Animation settings
+ANIMATION_SETTINGS: Final[Mapping[str, Any]] = _freeze({
+    "frame_rate": 24,
+    "lip_sync_threshold": 0.1,
+    "gesture_intensity": 0.8,
+    "idle_animation_loop": True,
+    "breathing_amplitude": 0.02
+})
+
+# Video Rendering Configuration
+VIDEO_SETTINGS: Final[Mapping[str, Mapping[str, Any]]] = _freeze({
+    "720p": {
+        "width": 1280,
+        "height": 720,
+        "bitrate": "2M",
+        "fps": 24
+    },
+    "1080p": {
+        "width": 1920,
+        "height": 1080,
+        "bitrate": "5M",
+        "fps": 24
+    },
+    "4k": {
+        "width": 3840,
+        "height": 2160,
+        "bitrate": "15M",
+        "fps": 24
+    }
+})
+
+# Aspect ratio configurations
+ASPECT_RATIOS: Final[Mapping[str, Mapping[str, float]]] = _freeze({
+    "16:9": {"width": 16, "height": 9},
+    "9:16": {"width": 9, "height": 16},
+    "1:1": {"width": 1, "height": 1}
+})
+
+# Audio settings
+AUDIO_SETTINGS: Final[Mapping[str, Any]] = _freeze({
+    "sample_rate": 44100,
+    "bit_depth": 16,
+    "channels": 1,
+    "format": "wav"
+})
+
+
+
+def _compute_video_dimensions(quality: str, aspect_ratio: str) -> Tuple[int, int]:
+    """Calculate dimensions maintaining aspect ratio"""
+    base_width = VIDEO_SETTINGS[quality]["width"]
+    base_height = VIDEO_SETTINGS[quality]["height"]
+    
+    if aspect_ratio == "9:16":
+        return base_height, base_width
+    elif aspect_ratio == "1:1":
+        size = min(base_width, base_height)
+        return size, size
+    
+    return base_width, base_height
+
+
+# (quality, aspect_ratio) -> (width, height), precomputed once at import
+_VIDEO_DIMENSIONS: Final[Mapping[Tuple[str, str], Tuple[int, int]]] = MappingProxyType({
+    (quality, aspect_ratio): _compute_video_dimensions(quality, aspect_ratio)
+    for quality in VIDEO_SETTINGS
+    for aspect_ratio in ASPECT_RATIOS
+})
+
+
+# Common Blender installation paths, probed in order
+_BLENDER_CANDIDATES: Final[Tuple[str, ...]] = (
+    "/Applications/Blender.app/Contents/MacOS/Blender",  # macOS
+    "/usr/bin/blender",  # Linux
+    "/snap/bin/blender",  # Linux Snap
+    "C:\\Program Files\\Blender Foundation\\Blender\\blender.exe",  # Windows
+    "blender"  # System PATH
+)
+
+# Fields that may be overridden from the environment
+_ENV_FIELDS: Final[Tuple[str, ...]] = ("API_HOST", "API_PORT", "API_RELOAD", "DEBUG", "LOG_LEVEL", "BLENDER_PATH")
+
+# slots=True is only accepted by dataclass on Python 3.10+
+_DATACLASS_OPTIONS: Final[Dict[str, Any]] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _coerce_env_value(raw: str, default: Any) -> Any:
+    """Convert an environment string to the type of the field default"""
+    if isinstance(default, bool):
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(raw)
+    if default is None:
+        return raw or None
+    return raw
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Settings:
+    """Application settings with environment variable overrides"""
     
     # Project paths
     PROJECT_ROOT: Path = Path(__file__).parent.parent
@@ -26,7 +162,7 @@ class Settings(BaseSettings):
     # API Configuration
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
-    API_RELOAD: bool = True
+    API_RELOAD: bool = False  # Code reloading for development; needs a watcher process
     
     # Web Interface Configuration
     WEB_HOST: str = "0.0.0.0"
@@ -36,24 +172,14 @@ class Settings(BaseSettings):
     TTS_ENGINE: str = "gtts"  # gtts, coqui, pyttsx3
     TTS_CACHE_ENABLED: bool = True
     TTS_CACHE_DIR: Path = CACHE_DIR / "tts"
+    TTS_GTTS_MAX_CONCURRENCY: int = 4  # Simultaneous gTTS HTTP requests
+    TTS_MEMORY_CACHE_SIZE: int = 32  # Recent clips also kept in memory, in front of the disk cache
     
     # Supported languages
-    SUPPORTED_LANGUAGES: Dict[str, str] = {
-        "en": "English",
-        "hi": "Hindi"
-    }
+    SUPPORTED_LANGUAGES: ClassVar[Mapping[str, str]] = SUPPORTED_LANGUAGES
     
     # Voice configuration
-    VOICE_CONFIGS: Dict[str, Dict[str, Any]] = {
-        "gtts": {
-            "en": {"tld": "com", "slow": False},
-            "hi": {"tld": "co.in", "slow": False}
-        },
-        "pyttsx3": {
-            "rate": 150,
-            "volume": 0.9
-        }
-    }
+    VOICE_CONFIGS: ClassVar[Mapping[str, Mapping[str, Any]]] = VOICE_CONFIGS
     
     # Animation Configuration
     BLENDER_PATH: Optional[str] = None  # Auto-detect if None
@@ -62,50 +188,16 @@ class Settings(BaseSettings):
     ANIMATION_CACHE_DIR: Path = CACHE_DIR / "animations"
     
     # Animation settings
-    ANIMATION_SETTINGS: Dict[str, Any] = {
-        "frame_rate": 24,
-        "lip_sync_threshold": 0.1,
-        "gesture_intensity": 0.8,
-        "idle_animation_loop": True,
-        "breathing_amplitude": 0.02
-    }
+    ANIMATION_SETTINGS: ClassVar[Mapping[str, Any]] = ANIMATION_SETTINGS
     
     # Video Rendering Configuration
-    VIDEO_SETTINGS: Dict[str, Dict[str, Any]] = {
-        "720p": {
-            "width": 1280,
-            "height": 720,
-            "bitrate": "2M",
-            "fps": 24
-        },
-        "1080p": {
-            "width": 1920,
-            "height": 1080,
-            "bitrate": "5M",
-            "fps": 24
-        },
-        "4k": {
-            "width": 3840,
-            "height": 2160,
-            "bitrate": "15M",
-            "fps": 24
-        }
-    }
+    VIDEO_SETTINGS: ClassVar[Mapping[str, Mapping[str, Any]]] = VIDEO_SETTINGS
     
     # Aspect ratio configurations
-    ASPECT_RATIOS: Dict[str, Dict[str, float]] = {
-        "16:9": {"width": 16, "height": 9},
-        "9:16": {"width": 9, "height": 16},
-        "1:1": {"width": 1, "height": 1}
-    }
+    ASPECT_RATIOS: ClassVar[Mapping[str, Mapping[str, float]]] = ASPECT_RATIOS
     
     # Audio settings
-    AUDIO_SETTINGS: Dict[str, Any] = {
-        "sample_rate": 44100,
-        "bit_depth": 16,
-        "channels": 1,
-        "format": "wav"
-    }
+    AUDIO_SETTINGS: ClassVar[Mapping[str, Any]] = AUDIO_SETTINGS
     
     # Performance settings
     MAX_WORKERS: int = 4
@@ -131,16 +223,30 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     RELOAD_ON_CHANGE: bool = True
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    # Directories already created in this process, shared across instances
+    _seen_dirs: ClassVar[Set[str]] = set()
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def __post_init__(self):
+        self._load_environment()
         self._create_directories()
         self._load_config_file()
     
+    def _load_environment(self):
+        """Apply overrides for the documented environment variables, from the environment or .env"""
+        env_file = self.PROJECT_ROOT / ".env"
+        env_file_values: Dict[str, Optional[str]] = {}
+        if env_file.is_file():
+            from dotenv import dotenv_values
+            env_file_values = dotenv_values(env_file, encoding="utf-8")
+        
+        for name in _ENV_FIELDS:
+            # The real environment takes precedence over the .env file
+            raw = os.environ.get(name)
+            if raw is None:
+                raw = env_file_values.get(name)
+            if raw is not None:
+                setattr(self, name, _coerce_env_value(raw, getattr(self, name)))
+    
     def _create_directories(self):
         """Create necessary directories if they don't exist"""
         directories = [
@@ -149,68 +255,114 @@ class Settings(BaseSettings):
             self.TTS_CACHE_DIR, self.ANIMATION_CACHE_DIR
         ]
         
-        for directory in directories:
+        seen = Settings._seen_dirs
+        
+        # Parents first, so nested children short-circuit on the seen-set
+        for directory in sorted(directories, key=lambda d: len(d.parts)):
+            key = str(directory)
+            if key in seen:
+                continue
             directory.mkdir(parents=True, exist_ok=True)
+            seen.add(key)
+            seen.update(str(parent) for parent in directory.parents)
     
     def _load_config_file(self):
         """Load additional configuration from YAML file"""
         config_file = self.PROJECT_ROOT / "config" / "config.yaml"
         if config_file.exists():
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f)
-                    if config_data:
-                        # Update settings with config file data
-                        for key, value in config_data.items():
-                            if hasattr(self, key.upper()):
-                                setattr(self, key.upper(), value)
+                config_data = self._read_config_data(config_file)
+                if config_data:
+                    # Update settings with config file data (fields only, not ClassVar tables)
+                    field_names = {f.name for f in fields(self)}
+                    for key, value in config_data.items():
+                        if key.upper() in field_names:
+                            setattr(self, key.upper(), value)
             except Exception as e:
                 print(f"Warning: Could not load config file: {e}")
     
-    def get_video_dimensions(self, quality: str, aspect_ratio: str) -> tuple:
-        """Get video dimensions based on quality and aspect ratio"""
-        base_settings = self.VIDEO_SETTINGS[quality]
-        ratio_settings = self.ASPECT_RATIOS[aspect_ratio]
+    def _read_config_data(self, config_file: Path) -> Optional[Dict[str, Any]]:
+        """Read YAML config, memoized per process by (path, mtime)"""
+        mtime_ns = config_file.stat().st_mtime_ns
+        # The memoized dict is shared; each caller gets its own copy to apply or modify
+        return copy.deepcopy(self._parse_config_file(str(config_file.resolve()), mtime_ns))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _parse_config_file(path_str: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+        """Parse YAML config, reusing a JSON sidecar cache while it is fresh"""
+        config_file = Path(path_str)
+        cache_file = config_file.with_name(config_file.name + ".cache.json")
+        
+        # JSON parses much faster than YAML, so prefer the sidecar when valid
+        try:
+            if cache_file.stat().st_mtime_ns >= mtime_ns:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get("mtime_ns") == mtime_ns:
+                    return cached.get("data")
+        except (OSError, ValueError):
+            pass
         
-        # Calculate dimensions maintaining aspect ratio
-        base_width = base_settings["width"]
-        base_height = base_settings["height"]
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config_data = yaml.load(f, Loader=YamlLoader)
         
-        if aspect_ratio == "16:9":
-            return base_width, base_height
-        elif aspect_ratio == "9:16":
-            return base_height, base_width
-        elif aspect_ratio == "1:1":
-            size = min(base_width, base_height)
-            return size, size
+        # Write the sidecar atomically so concurrent readers never see a partial file
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"mtime_ns": mtime_ns, "data": config_data}, f)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Warning: Could not write config cache: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
         
-        return base_width, base_height
+        return config_data
+    
+    def get_video_dimensions(self, quality: str, aspect_ratio: str) -> tuple:
+        """Get video dimensions based on quality and aspect ratio (KeyError for unknown values)"""
+        return _VIDEO_DIMENSIONS[(quality, aspect_ratio)]
     
     def get_blender_executable(self) -> Optional[str]:
         """Auto-detect Blender executable path"""
         if self.BLENDER_PATH:
             return self.BLENDER_PATH
         
-        # Common Blender installation paths
-        common_paths = [
-            "/Applications/Blender.app/Contents/MacOS/Blender",  # macOS
-            "/usr/bin/blender",  # Linux
-            "/snap/bin/blender",  # Linux Snap
-            "C:\\Program Files\\Blender Foundation\\Blender\\blender.exe",  # Windows
-            "blender"  # System PATH
-        ]
-        
-        for path in common_paths:
-            if os.path.exists(path) or self._command_exists(path):
+        return self._detect_blender_executable()
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _detect_blender_executable() -> Optional[str]:
+        """Probe common Blender locations once per process"""
+        for path in _BLENDER_CANDIDATES:
+            # Absolute candidates only need a stat; bare names need a PATH search
+            if os.path.isabs(path):
+                exists = os.path.exists(path)
+            else:
+                exists = Settings._command_exists(path)
+            if exists:
                 return path
         
         return None
     
-    def _command_exists(self, command: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _command_exists(command: str) -> bool:
         """Check if command exists in system PATH"""
-        import shutil
         return shutil.which(command) is not None
 
 
-# Global settings instance
-settings = Settings()
+# Global settings instance, created on first access (PEP 562)
+_settings: Optional[Settings] = None
+
+
+def __getattr__(name: str) -> Any:
+    global _settings
+    if name == "settings":
+        if _settings is None:
+            _settings = Settings()
+        return _settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,27 @@
+"""
+Render Kernel AOT Build Script
+Compiles the render kernels ahead of time with Numba, so processes load them without JIT warm-up
+"""
+
+import sys
+from pathlib import Path
+
+from numba.pycc import CC
+
+# Add project path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.main import _wrap_kernel
+
+# Built as src/render_kernels.<abi>.so, where src/main.py looks for it first
+cc = CC("render_kernels")
+cc.output_dir = str(project_root / "src")
+cc.verbose = True
+
+cc.export("wrap_indices", "i4[:](i4[:], i4)")(_wrap_kernel(compiled=False))
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Render kernels compiled into {cc.output_dir}")
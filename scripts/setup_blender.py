@@ -9,7 +9,8 @@ import os
 import sys
 from pathlib import Path
 from mathutils import Vector, Euler
-import json
+import numpy as np
+import pprint
 
 # Add project path
 project_root = Path(__file__).parent.parent
@@ -17,6 +18,20 @@ sys.path.insert(0, str(project_root))
 
 from config.settings import settings
 
+# Armature bone table: (name, head, tail, parent), with L/R sides precomputed
+BONE_SPEC = (
+    ("Spine", (0, 0, 1), (0, 0, 1.5), "Root"),
+    ("Head", (0, 0, 1.5), (0, 0.5, 2), "Spine"),
+    ("Jaw", (0, 0.3, 1.7), (0, 0.5, 1.6), "Head"),  # Lip sync
+    ("Shoulder.L", (0.8, 0, 1.3), (1.2, 0, 1.3), "Spine"),
+    ("Arm.L", (1.2, 0, 1.3), (1.5, 0, 1), "Shoulder.L"),
+    ("Shoulder.R", (-0.8, 0, 1.3), (-1.2, 0, 1.3), "Spine"),
+    ("Arm.R", (-1.2, 0, 1.3), (-1.5, 0, 1), "Shoulder.R"),
+)
+
+# Keyframe.interpolation enum index for 'BEZIER', used with foreach_set
+BEZIER_INTERPOLATION = 2
+
 
 class BlenderSetup:
     """Setup Blender environment for video generation"""
@@ -144,7 +159,7 @@ class BlenderSetup:
         
         # Extrude for legs
         bm.faces.ensure_lookup_table()
-        bottom_face = [f for f in bm.faces if f.normal.z < -0.5][0]
+        bottom_face = next((f for f in bm.faces if f.normal.z < -0.5), None)
         
         # Create legs (simplified)
         leg_positions = [(-0.5, -0.3, 0), (0.5, -0.3, 0), (-0.5, 0.3, 0), (0.5, 0.3, 0)]
@@ -184,37 +199,16 @@ class BlenderSetup:
         root_bone = edit_bones[0]
         root_bone.name = "Root"
         
-        # Add spine bones
-        spine_bone = edit_bones.new("Spine")
-        spine_bone.head = (0, 0, 1)
-        spine_bone.tail = (0, 0, 1.5)
-        spine_bone.parent = root_bone
-        
-        # Add head bone
-        head_bone = edit_bones.new("Head")
-        head_bone.head = (0, 0, 1.5)
-        head_bone.tail = (0, 0.5, 2)
-        head_bone.parent = spine_bone
-        
-        # Add jaw bone for lip sync
-        jaw_bone = edit_bones.new("Jaw")
-        jaw_bone.head = (0, 0.3, 1.7)
-        jaw_bone.tail = (0, 0.5, 1.6)
-        jaw_bone.parent = head_bone
-        
-        # Add arm bones
-        for side in ['L', 'R']:
-            multiplier = 1 if side == 'L' else -1
-            
-            shoulder_bone = edit_bones.new(f"Shoulder.{side}")
-            shoulder_bone.head = (0.8 * multiplier, 0, 1.3)
-            shoulder_bone.tail = (1.2 * multiplier, 0, 1.3)
-            shoulder_bone.parent = spine_bone
-            
-            arm_bone = edit_bones.new(f"Arm.{side}")
-            arm_bone.head = (1.2 * multiplier, 0, 1.3)
-            arm_bone.tail = (1.5 * multiplier, 0, 1)
-            arm_bone.parent = shoulder_bone
+        # Create all bones first, then assign geometry and hierarchy in one pass
+        bones = {"Root": root_bone}
+        for name, _, _, _ in BONE_SPEC:
+            bones[name] = edit_bones.new(name)
+        
+        for name, head, tail, parent in BONE_SPEC:
+            bone = bones[name]
+            bone.head = head
+            bone.tail = tail
+            bone.parent = bones[parent]
         
         # Exit edit mode
         bpy.ops.object.mode_set(mode='OBJECT')
@@ -247,11 +241,7 @@ class BlenderSetup:
         if not armature:
             return
         
-        # Select armature
-        bpy.context.view_layer.objects.active = armature
-        bpy.ops.object.mode_set(mode='POSE')
-        
-        # Create idle action
+        # Create idle action (written straight to fcurves, so no pose mode needed)
         action = bpy.data.actions.new(name="Idle")
         armature.animation_data_create()
         armature.animation_data.action = action
@@ -260,15 +250,17 @@ class BlenderSetup:
         spine_bone = armature.pose.bones.get("Spine")
         if spine_bone:
             # Keyframe breathing animation
-            frames = [1, 30, 60, 90, 120]
-            scales = [1.0, 1.02, 1.0, 1.02, 1.0]
+            frames = np.array([1, 30, 60, 90, 120], dtype=np.float32)
+            scales = np.array([1.0, 1.02, 1.0, 1.02, 1.0], dtype=np.float32)
             
-            for frame, scale in zip(frames, scales):
-                bpy.context.scene.frame_set(frame)
-                spine_bone.scale = (1, 1, scale)
-                spine_bone.keyframe_insert(data_path="scale")
+            # Write all keyframes in one batch instead of frame_set + keyframe_insert
+            fcurve = action.fcurves.new(data_path='pose.bones["Spine"].scale', index=2)
+            keyframes = fcurve.keyframe_points
+            keyframes.add(len(frames))
+            keyframes.foreach_set("co", np.column_stack([frames, scales]).ravel())
+            keyframes.foreach_set("interpolation", np.full(len(frames), BEZIER_INTERPOLATION, dtype=np.int32))
+            fcurve.update()
         
-        bpy.ops.object.mode_set(mode='OBJECT')
         print("💨 Idle animation created")
     
     def create_talking_animation(self):
@@ -349,9 +341,12 @@ class BlenderSetup:
             }
         }
         
-        data_file = self.character_dir / "character_data.json"
-        with open(data_file, 'w') as f:
-            json.dump(character_data, f, indent=2)
+        # Emit a Python module so consumers load it as cached bytecode
+        # instead of re-parsing JSON on every import
+        data_file = self.character_dir / "character_data.py"
+        with open(data_file, 'w', encoding='utf-8') as f:
+            f.write('"""\nCharacter data generated by scripts/setup_blender.py\n"""\n\n')
+            f.write(f"CHARACTER_DATA = {pprint.pformat(character_data, sort_dicts=False)}\n")
         
         print(f"📄 Character data exported: {data_file}")
 
@@ -368,7 +363,7 @@ def main():
     print("\n🎉 Blender setup complete!")
     print("📁 Files created:")
     print(f"  - {setup.character_dir}/bull_character.blend")
-    print(f"  - {setup.character_dir}/character_data.json")
+    print(f"  - {setup.character_dir}/character_data.py")
 
 
 if __name__ == "__main__":
@@ -2,13 +2,22 @@
 Setup script for AI Text-to-Video Platform
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 from pathlib import Path
 
 # Read README
 this_directory = Path(__file__).parent
 long_description = (this_directory / "README.md").read_text()
 
+# Explicit package list (avoids walking the whole tree with find_packages);
+# keep in sync when adding a package directory
+PACKAGES = [
+    "config",
+    "src",
+    "src.core",
+    "src.web",
+]
+
 setup(
     name="ai-text-to-video-platform",
     version="1.0.0",
@@ -18,7 +27,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/your-repo/ai-text-to-video-platform",
-    packages=find_packages(),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -87,6 +96,9 @@ setup(
             "celery>=5.3.4",
             "redis>=5.0.1",
             "bark>=1.0.0",
+            "numba>=0.58.0",
+            "pyahocorasick>=2.0.0",
+            "uvloop>=0.18.0; sys_platform != 'win32'",
         ]
     },
     entry_points={
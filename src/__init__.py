@@ -5,3 +5,11 @@ AI Text-to-Video Platform
 __version__ = "1.0.0"
 __author__ = "AI Text-to-Video Platform Team"
 __description__ = "AI-powered platform for converting text to animated videos"
+
+
+def __getattr__(name: str):
+    # Re-export the global settings lazily, so importing the package does not create them
+    if name == "settings":
+        from config import settings
+        return settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
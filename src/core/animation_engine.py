@@ -4,17 +4,24 @@ Handles 3D character animation and lip-sync for text-to-video generation
 """
 
 import bpy
-import bmesh
 import mathutils
+import functools
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 import json
 import wave
 import struct
 from loguru import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 @dataclass
 class AnimationCue:
@@ -33,6 +40,282 @@ class LipSyncData:
     timestamps: List[float]
     intensities: List[float]
     mouth_shapes: List[str]
+    mouth_ids: Optional[np.ndarray] = None  # Mouth category per phoneme (see MOUTH_*)
+
+
+# Mouth shape categories used for lip-sync scaling
+MOUTH_OPEN = 0     # A, O
+MOUTH_SPREAD = 1   # E, I
+MOUTH_PRESSED = 2  # M
+MOUTH_REST = 3     # CLOSED and everything else
+
+_MOUTH_CATEGORIES = {'A': MOUTH_OPEN, 'O': MOUTH_OPEN, 'E': MOUTH_SPREAD, 'I': MOUTH_SPREAD, 'M': MOUTH_PRESSED}
+
+# Per-category scale offsets: scale = 1.0 + offset * intensity
+_Y_SCALE_LUT = np.array([0.5, 0.3, -0.2, 0.0], dtype=np.float32)
+_Z_SCALE_LUT = np.array([0.3, -0.2, 0.0, 0.0], dtype=np.float32)
+
+
+# Key count above which the compiled scale kernel is used instead of the LUTs
+_NUMBA_MIN_KEYS = 10_000
+
+
+def _mouth_scales_lut(mouth_ids: np.ndarray, intensities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Y/Z mouth scales by category table lookup"""
+    return 1.0 + _Y_SCALE_LUT[mouth_ids] * intensities, 1.0 + _Z_SCALE_LUT[mouth_ids] * intensities
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _mouth_scales_jit(mouth_ids, intensities):
+        """Y/Z mouth scales per key, compiled (same values as the LUTs)"""
+        count = mouth_ids.shape[0]
+        y_scales = np.ones(count, dtype=np.float32)
+        z_scales = np.ones(count, dtype=np.float32)
+        for i in range(count):
+            mouth = mouth_ids[i]
+            intensity = intensities[i]
+            if mouth == MOUTH_OPEN:
+                y_scales[i] = 1.0 + intensity * 0.5
+                z_scales[i] = 1.0 + intensity * 0.3
+            elif mouth == MOUTH_SPREAD:
+                y_scales[i] = 1.0 + intensity * 0.3
+                z_scales[i] = 1.0 - intensity * 0.2
+            elif mouth == MOUTH_PRESSED:
+                y_scales[i] = 1.0 - intensity * 0.2
+        return y_scales, z_scales
+
+
+def _mouth_scales(mouth_ids: np.ndarray, intensities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Y/Z mouth scales, using the numba kernel for very long keyframe streams"""
+    if NUMBA_AVAILABLE and len(mouth_ids) > _NUMBA_MIN_KEYS:
+        return _mouth_scales_jit(mouth_ids, intensities)
+    return _mouth_scales_lut(mouth_ids, intensities)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Mark a shared lookup table read-only"""
+    array.flags.writeable = False
+    return array
+
+
+# Phoneme to mouth shape mapping
+PHONEME_MAPPING = MappingProxyType({
+    'A': 'A', 'E': 'E', 'I': 'I', 'O': 'O', 'U': 'U',
+    'B': 'M', 'P': 'M', 'M': 'M',
+    'F': 'F', 'V': 'F',
+    'TH': 'TH', 'S': 'S', 'Z': 'S',
+    'L': 'L', 'R': 'L',
+    'T': 'T', 'D': 'T', 'N': 'T',
+    'K': 'K', 'G': 'K',
+    'SILENCE': 'CLOSED'
+})
+
+
+def _phoneme_intensity(phoneme: str) -> float:
+    """Mouth opening intensity for a phoneme"""
+    if phoneme in ['A', 'E', 'I', 'O', 'U']:
+        return 0.8  # High intensity for vowels
+    elif phoneme == 'SILENCE':
+        return 0.0
+    return 0.6  # Medium intensity for consonants
+
+
+# Integer-encoded lookup tables for vectorized lip-sync; the extra trailing
+# phoneme id covers unmapped phonemes (CLOSED mouth, consonant intensity)
+_PHONEME_IDS = MappingProxyType({phoneme: i for i, phoneme in enumerate(PHONEME_MAPPING)})
+_UNKNOWN_PHO_ID = len(_PHONEME_IDS)
+_SHAPE_NAMES = tuple(dict.fromkeys([*PHONEME_MAPPING.values(), 'CLOSED']))
+_SHAPE_BY_PHO = _read_only(np.array(
+    [_SHAPE_NAMES.index(shape) for shape in PHONEME_MAPPING.values()] + [_SHAPE_NAMES.index('CLOSED')],
+    dtype=np.int8
+))
+_MOUTH_BY_SHAPE = _read_only(np.array(
+    [_MOUTH_CATEGORIES.get(shape, MOUTH_REST) for shape in _SHAPE_NAMES], dtype=np.int8
+))
+_INTENSITY_BY_PHO = _read_only(np.array([_phoneme_intensity(phoneme) for phoneme in PHONEME_MAPPING] + [0.6]))
+
+
+@functools.lru_cache(maxsize=128)
+def _compute_lipsync_arrays(phonemes: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Kept key indices, shape ids, mouth categories and intensities for a phoneme sequence"""
+    # The tables are frozen at import, so results depend only on the phonemes and
+    # can be shared between calls as read-only arrays
+    # Encode phonemes once, then map them to shapes/intensities by table lookup
+    phoneme_id, unknown_id = _PHONEME_IDS.get, _UNKNOWN_PHO_ID
+    ids = np.fromiter(
+        (phoneme_id(phoneme, unknown_id) for phoneme in phonemes),
+        dtype=np.int8, count=len(phonemes)
+    )
+    shape_ids = _SHAPE_BY_PHO[ids]
+    mouth_ids = _MOUTH_BY_SHAPE[shape_ids]
+    intensities = _INTENSITY_BY_PHO[ids]
+    
+    # Drop keys in the middle of runs of identical mouth poses; keeping the
+    # first and last key of each run preserves the held pose exactly
+    same = (mouth_ids[1:] == mouth_ids[:-1]) & (intensities[1:] == intensities[:-1])
+    keep = np.ones(len(ids), dtype=bool)
+    keep[1:-1] = ~(same[:-1] & same[1:])
+    
+    return (
+        _read_only(np.flatnonzero(keep)),
+        _read_only(shape_ids[keep]),
+        _read_only(mouth_ids[keep]),
+        _read_only(intensities[keep]),
+    )
+
+
+# Gesture rotation keys per axis as (position, amplitude) pairs: a key lands at
+# start + position * (end - start) // 4 with value intensity * amplitude
+GESTURE_KEYFRAMES = MappingProxyType({
+    'pointing': {'ry': ((0, 0.0), (2, 0.3), (4, 0.0))},      # 0.3 radians
+    'emphasis': {'rx': ((0, 0.0), (2, -0.2), (4, 0.0))},     # Slight nod
+    'questioning': {'rz': ((0, 0.0), (2, 0.2), (4, 0.0))},   # Head tilt
+    'thinking': {                                             # Slow head movement
+        'rx': ((0, 0.0), (1, -0.1), (2, 0.0), (3, 0.1), (4, 0.0)),
+        'ry': ((0, 0.0), (1, 0.15), (2, 0.0), (3, -0.15), (4, 0.0)),
+    },
+})
+
+# Set once the default collections have been replaced in this Blender session
+_scene_initialized = False
+
+
+@dataclass(frozen=True)
+class _MeshGeometry:
+    """Polygon mesh as flat arrays, ready for foreach_set"""
+    vertices: np.ndarray       # (n, 3) float32 coordinates
+    loop_vertices: np.ndarray  # vertex index per face corner
+    loop_starts: np.ndarray    # first loop of each face
+    loop_totals: np.ndarray    # corner count of each face
+
+
+def _mesh_geometry(vertices, faces_loops, loop_totals) -> _MeshGeometry:
+    """Pack vertex/face arrays into read-only geometry (results are cached and shared)"""
+    loop_totals = np.asarray(loop_totals, dtype=np.int32)
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    arrays = (
+        np.ascontiguousarray(vertices, dtype=np.float32),
+        np.asarray(faces_loops, dtype=np.int32),
+        loop_starts,
+        loop_totals,
+    )
+    for array in arrays:
+        array.flags.writeable = False
+    return _MeshGeometry(*arrays)
+
+
+@functools.lru_cache(maxsize=None)
+def _cone_geometry(radius1: float, radius2: float, depth: float, segments: int = 32) -> _MeshGeometry:
+    """Capped cone (a cylinder when both radii match), centred on the origin along Z"""
+    angles = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    ring = np.column_stack([np.cos(angles), np.sin(angles)])
+    half_depth = depth / 2
+    vertices = np.vstack([
+        np.column_stack([ring * radius1, np.full(segments, -half_depth)]),
+        np.column_stack([ring * radius2, np.full(segments, half_depth)]),
+    ])
+    
+    # Side quads, then the bottom cap (reversed so it faces down) and the top cap
+    k = np.arange(segments)
+    k_next = (k + 1) % segments
+    sides = np.column_stack([k, k_next, k_next + segments, k + segments]).ravel()
+    loops = np.concatenate([sides, k[::-1], k + segments])
+    totals = np.concatenate([np.full(segments, 4), [segments, segments]])
+    return _mesh_geometry(vertices, loops, totals)
+
+
+def _cylinder_geometry(radius: float, depth: float, segments: int = 32) -> _MeshGeometry:
+    """Capped cylinder (same defaults as primitive_cylinder_add)"""
+    return _cone_geometry(radius, radius, depth, segments)
+
+
+@functools.lru_cache(maxsize=None)
+def _uv_sphere_geometry(radius: float, segments: int = 32, ring_count: int = 16) -> _MeshGeometry:
+    """UV sphere (same defaults as primitive_uv_sphere_add)"""
+    polar = np.pi * np.arange(1, ring_count) / ring_count
+    azimuth = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    ring_z = np.repeat(np.cos(polar), segments)
+    ring_r = np.repeat(np.sin(polar), segments)
+    ring_xy = np.tile(np.column_stack([np.cos(azimuth), np.sin(azimuth)]), (ring_count - 1, 1))
+    vertices = radius * np.vstack([
+        [0.0, 0.0, 1.0],
+        np.column_stack([ring_xy * ring_r[:, None], ring_z]),
+        [0.0, 0.0, -1.0],
+    ])
+    
+    # Ring r, vertex j lives at 1 + r * segments + j; poles are first and last
+    top, bottom = 0, len(vertices) - 1
+    j = np.arange(segments)
+    j_next = (j + 1) % segments
+    rings = 1 + segments * np.arange(ring_count - 1)[:, None]
+    upper, lower = rings[:-1], rings[1:]
+    
+    top_fan = np.column_stack([np.full(segments, top), 1 + j, 1 + j_next]).ravel()
+    quads = np.stack([upper + j, lower + j, lower + j_next, upper + j_next], axis=-1).ravel()
+    last = rings[-1]
+    bottom_fan = np.column_stack([np.full(segments, bottom), last + j_next, last + j]).ravel()
+    
+    loops = np.concatenate([top_fan, quads, bottom_fan])
+    totals = np.concatenate([
+        np.full(segments, 3), np.full(segments * (ring_count - 2), 4), np.full(segments, 3)
+    ])
+    return _mesh_geometry(vertices, loops, totals)
+
+
+def _build_mesh(name: str, geometry: _MeshGeometry):
+    """Create a mesh datablock from flat geometry arrays with foreach_set"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(geometry.vertices))
+    mesh.vertices.foreach_set("co", geometry.vertices.ravel())
+    mesh.loops.add(len(geometry.loop_vertices))
+    mesh.loops.foreach_set("vertex_index", geometry.loop_vertices)
+    mesh.polygons.add(len(geometry.loop_starts))
+    mesh.polygons.foreach_set("loop_start", geometry.loop_starts)
+    # Blender 4.0+ derives loop_total from loop_start and makes it read-only
+    if not bpy.types.MeshPolygon.bl_rna.properties['loop_total'].is_readonly:
+        mesh.polygons.foreach_set("loop_total", geometry.loop_totals)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def _interpolation_value(name: str) -> int:
+    """Keyframe.interpolation enum value, as expected by foreach_set"""
+    return bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items[name].value
+
+
+def _set_keyframes(fcurve, frames, values, interpolation: str):
+    """Replace an fcurve's keyframes with one add + foreach_set instead of per-key insert()"""
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    keyframe_points = fcurve.keyframe_points
+    if frames.size == 0:
+        keyframe_points.clear()
+        return
+    
+    # insert() replaces an existing key on the same frame, so keep the last value per frame
+    frames, last = np.unique(frames[::-1], return_index=True)
+    values = values[::-1][last]
+    
+    co = np.empty(2 * len(frames), dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    
+    # Reused fcurves keep their keyframe storage when the key count is unchanged
+    if len(keyframe_points) != len(frames):
+        keyframe_points.clear()
+        keyframe_points.add(len(frames))
+    keyframe_points.foreach_set("co", co)
+    keyframe_points.foreach_set(
+        "interpolation", np.full(len(frames), _interpolation_value(interpolation), dtype=np.int32)
+    )
+    fcurve.update()
+
+
+def _get_fcurve(action, data_path: str, index: int):
+    """Existing fcurve of an action, or a new one"""
+    return action.fcurves.find(data_path, index=index) or action.fcurves.new(data_path=data_path, index=index)
 
 
 class BlenderAnimationEngine:
@@ -41,6 +324,10 @@ class BlenderAnimationEngine:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.character_model = None
+        self.mouth_obj = None
+        self._parts = {}
+        self._animated_objects = set()
+        self._actions = {}
         self.scene = None
         self.animation_data = {}
         self.lip_sync_data = None
@@ -49,17 +336,8 @@ class BlenderAnimationEngine:
         self.frame_rate = config.get('frame_rate', 24)
         self.scene_duration = 0
         
-        # Phoneme to mouth shape mapping
-        self.phoneme_mapping = {
-            'A': 'A', 'E': 'E', 'I': 'I', 'O': 'O', 'U': 'U',
-            'B': 'M', 'P': 'M', 'M': 'M',
-            'F': 'F', 'V': 'F',
-            'TH': 'TH', 'S': 'S', 'Z': 'S',
-            'L': 'L', 'R': 'L',
-            'T': 'T', 'D': 'T', 'N': 'T',
-            'K': 'K', 'G': 'K',
-            'SILENCE': 'CLOSED'
-        }
+        # Deprecated: kept for callers that read it; lookups use the module tables
+        self.phoneme_mapping = dict(PHONEME_MAPPING)
         
         self._setup_blender_scene()
     
@@ -67,11 +345,10 @@ class BlenderAnimationEngine:
         """Initialize Blender scene for animation"""
         try:
             # Clear existing scene
-            bpy.ops.wm.read_factory_settings(use_empty=True)
+            scene = bpy.context.scene
+            self._clear_scene(scene)
             
             # Set up scene properties
-            scene = bpy.context.scene
-            scene.frame_set(1)
             scene.frame_start = 1
             scene.render.fps = self.frame_rate
             
@@ -84,6 +361,9 @@ class BlenderAnimationEngine:
             # Load or create character model
             self._load_character_model()
             
+            # Evaluate the depsgraph once, after everything has been created
+            scene.frame_set(1)
+            
             self.scene = scene
             logger.info("Blender scene initialized successfully")
             
@@ -91,31 +371,50 @@ class BlenderAnimationEngine:
             logger.error(f"Failed to setup Blender scene: {e}")
             raise
     
+    def _clear_scene(self, scene):
+        """Empty the scene through bpy.data instead of reloading factory settings"""
+        global _scene_initialized
+        
+        data = bpy.data
+        data.batch_remove([
+            *data.objects, *data.meshes, *data.lights, *data.cameras, *data.materials, *data.actions
+        ])
+        
+        # The collection layout only needs replacing once per process
+        if not _scene_initialized:
+            data.batch_remove(list(data.collections))
+            collection = data.collections.new("Scene_Content")
+            scene.collection.children.link(collection)
+            view_layer = bpy.context.view_layer
+            view_layer.active_layer_collection = view_layer.layer_collection.children[collection.name]
+            _scene_initialized = True
+    
     def _setup_lighting(self):
         """Setup scene lighting"""
         # Add sun light
-        bpy.ops.object.light_add(type='SUN', location=(5, 5, 10))
-        sun = bpy.context.object
-        sun.data.energy = 3.0
-        sun.name = "Sun_Main"
+        self._add_light("Sun_Main", 'SUN', location=(5, 5, 10), energy=3.0)
         
         # Add fill light
-        bpy.ops.object.light_add(type='AREA', location=(-5, 5, 8))
-        fill_light = bpy.context.object
-        fill_light.data.energy = 1.5
-        fill_light.name = "Fill_Light"
+        self._add_light("Fill_Light", 'AREA', location=(-5, 5, 8), energy=1.5)
         
         # Add rim light
-        bpy.ops.object.light_add(type='SPOT', location=(0, -8, 6))
-        rim_light = bpy.context.object
-        rim_light.data.energy = 2.0
-        rim_light.name = "Rim_Light"
+        self._add_light("Rim_Light", 'SPOT', location=(0, -8, 6), energy=2.0)
+    
+    def _add_light(self, name: str, light_type: str, location, energy: float):
+        """Create and link a light object through bpy.data instead of bpy.ops"""
+        light_data = bpy.data.lights.new(name=name, type=light_type)
+        light_data.energy = energy
+        light = bpy.data.objects.new(name, light_data)
+        light.location = location
+        bpy.context.collection.objects.link(light)
+        return light
     
     def _setup_camera(self):
         """Setup scene camera"""
-        bpy.ops.object.camera_add(location=(0, -8, 2))
-        camera = bpy.context.object
-        camera.name = "Main_Camera"
+        camera_data = bpy.data.cameras.new(name="Main_Camera")
+        camera = bpy.data.objects.new("Main_Camera", camera_data)
+        camera.location = (0, -8, 2)
+        bpy.context.collection.objects.link(camera)
         
         # Set camera as active
         bpy.context.scene.camera = camera
@@ -154,6 +453,7 @@ class BlenderAnimationEngine:
             for obj in data_to.objects:
                 if obj is not None:
                     bpy.context.collection.objects.link(obj)
+                    self._register_part(obj)
                     if 'bull' in obj.name.lower() or 'character' in obj.name.lower():
                         self.character_model = obj
                         
@@ -161,84 +461,101 @@ class BlenderAnimationEngine:
             bpy.ops.import_scene.fbx(filepath=str(model_path))
             # Find the imported character
             for obj in bpy.context.selected_objects:
-                if obj.type == 'MESH':
+                self._register_part(obj)
+                if obj.type == 'MESH' and not self.character_model:
                     self.character_model = obj
-                    break
                     
         elif model_path.suffix.lower() == '.obj':
             bpy.ops.import_scene.obj(filepath=str(model_path))
             for obj in bpy.context.selected_objects:
-                if obj.type == 'MESH':
+                self._register_part(obj)
+                if obj.type == 'MESH' and not self.character_model:
                     self.character_model = obj
-                    break
+    
+    def _register_part(self, obj):
+        """Remember an imported object, and the mouth among them, so animation never scans the scene"""
+        self._parts[obj.name] = obj
+        name = obj.name.lower()
+        if self.mouth_obj is None and ('snout' in name or 'mouth' in name):
+            self.mouth_obj = obj
     
     def _create_basic_bull_character(self):
         """Create a basic bull character using Blender primitives"""
         # Create body (cylinder)
-        bpy.ops.mesh.primitive_cylinder_add(radius=1.5, depth=3, location=(0, 0, 1))
-        body = bpy.context.object
-        body.name = "Bull_Body"
-        body.scale = (1.2, 0.8, 1.0)
+        body = self._add_mesh_part(
+            "Bull_Body", _cylinder_geometry(radius=1.5, depth=3),
+            location=(0, 0, 1), scale=(1.2, 0.8, 1.0)
+        )
         
         # Create head (sphere)
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=1, location=(0, 0, 3.5))
-        head = bpy.context.object
-        head.name = "Bull_Head"
-        head.scale = (1.2, 1.0, 0.8)
+        head = self._add_mesh_part(
+            "Bull_Head", _uv_sphere_geometry(radius=1),
+            location=(0, 0, 3.5), scale=(1.2, 1.0, 0.8)
+        )
         
         # Create horns
-        bpy.ops.mesh.primitive_cone_add(radius1=0.1, radius2=0.02, vertices=8, depth=0.8, location=(-0.5, 0, 4.2))
-        horn1 = bpy.context.object
-        horn1.name = "Bull_Horn_L"
-        horn1.rotation_euler = (0, 0.3, 0)
-        
-        bpy.ops.mesh.primitive_cone_add(radius1=0.1, radius2=0.02, vertices=8, depth=0.8, location=(0.5, 0, 4.2))
-        horn2 = bpy.context.object
-        horn2.name = "Bull_Horn_R"
-        horn2.rotation_euler = (0, -0.3, 0)
+        horn1 = self._add_mesh_part(
+            "Bull_Horn_L", _cone_geometry(radius1=0.1, radius2=0.02, depth=0.8, segments=8),
+            location=(-0.5, 0, 4.2), rotation=(0, 0.3, 0)
+        )
+        horn2 = self._add_mesh_part(
+            "Bull_Horn_R", _cone_geometry(radius1=0.1, radius2=0.02, depth=0.8, segments=8),
+            location=(0.5, 0, 4.2), rotation=(0, -0.3, 0)
+        )
         
         # Create legs
         leg_positions = [(-0.8, -0.5, -0.5), (0.8, -0.5, -0.5), (-0.8, 0.5, -0.5), (0.8, 0.5, -0.5)]
-        for i, pos in enumerate(leg_positions):
-            bpy.ops.mesh.primitive_cylinder_add(radius=0.2, depth=1.5, location=pos)
-            leg = bpy.context.object
-            leg.name = f"Bull_Leg_{i+1}"
+        legs = [
+            self._add_mesh_part(
+                f"Bull_Leg_{i+1}", _cylinder_geometry(radius=0.2, depth=1.5), location=pos
+            )
+            for i, pos in enumerate(leg_positions)
+        ]
         
         # Create eyes
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.15, location=(-0.3, -0.8, 3.7))
-        eye1 = bpy.context.object
-        eye1.name = "Bull_Eye_L"
-        
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.15, location=(0.3, -0.8, 3.7))
-        eye2 = bpy.context.object
-        eye2.name = "Bull_Eye_R"
+        eye1 = self._add_mesh_part(
+            "Bull_Eye_L", _uv_sphere_geometry(radius=0.15), location=(-0.3, -0.8, 3.7)
+        )
+        eye2 = self._add_mesh_part(
+            "Bull_Eye_R", _uv_sphere_geometry(radius=0.15), location=(0.3, -0.8, 3.7)
+        )
         
         # Create nose/snout
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.3, depth=0.5, location=(0, -1.0, 3.2))
-        snout = bpy.context.object
-        snout.name = "Bull_Snout"
-        snout.rotation_euler = (1.57, 0, 0)  # Rotate 90 degrees
-        
-        # Parent all parts to head for easier animation
-        head.select_set(True)
-        bpy.context.view_layer.objects.active = head
-        
-        # Select all bull parts
-        bull_parts = [body, horn1, horn2, eye1, eye2, snout]
-        for part in bull_parts:
-            part.select_set(True)
-        
-        # Parent to head
-        bpy.ops.object.parent_set(type='OBJECT')
+        snout = self._add_mesh_part(
+            "Bull_Snout", _cylinder_geometry(radius=0.3, depth=0.5),
+            location=(0, -1.0, 3.2), rotation=(1.57, 0, 0)  # Rotate 90 degrees
+        )
+        
+        # Parent all parts to head for easier animation, keeping their world
+        # placement; matrix_world is only refreshed by a depsgraph update, so
+        # invert the head's own (unparented) basis matrix instead
+        head_inverse = head.matrix_basis.inverted()
+        for part in [body, horn1, horn2, eye1, eye2, snout]:
+            part.parent = head
+            part.matrix_parent_inverse = head_inverse
         
         # Set the head as the main character model
         self.character_model = head
+        self.mouth_obj = snout
+        self._parts = {
+            'body': body, 'head': head, 'horn_l': horn1, 'horn_r': horn2,
+            'eye_l': eye1, 'eye_r': eye2, 'snout': snout, **{f'leg_{i+1}': leg for i, leg in enumerate(legs)}
+        }
         
         # Add materials
         self._add_character_materials()
         
         logger.info("Basic bull character created")
     
+    def _add_mesh_part(self, name: str, geometry: _MeshGeometry, location, scale=(1, 1, 1), rotation=(0, 0, 0)):
+        """Create and link a mesh object from precomputed geometry without bpy.ops"""
+        obj = bpy.data.objects.new(name, _build_mesh(name, geometry))
+        obj.location = location
+        obj.scale = scale
+        obj.rotation_euler = rotation
+        bpy.context.collection.objects.link(obj)
+        return obj
+    
     def _add_character_materials(self):
         """Add materials to the character"""
         # Bull brown material
@@ -257,41 +574,28 @@ class BlenderAnimationEngine:
         # Connect nodes
         bull_material.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
         
-        # Apply to bull objects
-        for obj in bpy.data.objects:
-            if obj.name.startswith('Bull_') and obj.type == 'MESH':
-                if obj.data.materials:
-                    obj.data.materials[0] = bull_material
-                else:
-                    obj.data.materials.append(bull_material)
+        # Apply to bull objects (all parts are meshes)
+        for obj in self._parts.values():
+            if obj.data.materials:
+                obj.data.materials[0] = bull_material
+            else:
+                obj.data.materials.append(bull_material)
     
     def generate_lip_sync_data(self, audio_file: str, phonemes: List[str], timestamps: List[float]) -> LipSyncData:
         """Generate lip-sync data from audio analysis"""
         try:
-            # Analyze audio for lip-sync
-            mouth_shapes = []
-            intensities = []
-            
-            for phoneme in phonemes:
-                # Map phoneme to mouth shape
-                mouth_shape = self.phoneme_mapping.get(phoneme, 'CLOSED')
-                mouth_shapes.append(mouth_shape)
-                
-                # Calculate intensity based on phoneme type
-                if phoneme in ['A', 'E', 'I', 'O', 'U']:
-                    intensity = 0.8  # High intensity for vowels
-                elif phoneme == 'SILENCE':
-                    intensity = 0.0
-                else:
-                    intensity = 0.6  # Medium intensity for consonants
-                
-                intensities.append(intensity)
+            # Shapes/intensities depend only on the phoneme sequence, so they are memoized
+            count = min(len(phonemes), len(timestamps))
+            kept, shape_ids, mouth_ids, intensities = _compute_lipsync_arrays(tuple(phonemes[:count]))
+            kept = kept.tolist()
+            shape_names = _SHAPE_NAMES
             
             return LipSyncData(
-                phonemes=phonemes,
-                timestamps=timestamps,
-                intensities=intensities,
-                mouth_shapes=mouth_shapes
+                phonemes=[phonemes[i] for i in kept],
+                timestamps=[timestamps[i] for i in kept],
+                intensities=intensities.tolist(),
+                mouth_shapes=[shape_names[i] for i in shape_ids.tolist()],
+                mouth_ids=mouth_ids
             )
             
         except Exception as e:
@@ -313,7 +617,7 @@ class BlenderAnimationEngine:
             self._clear_animations()
             
             # Apply lip-sync animation
-            self._animate_lip_sync(lip_sync_data)
+            self.update_lip_sync(lip_sync_data)
             
             # Apply gesture animations
             self._animate_gestures(animation_cues)
@@ -329,177 +633,155 @@ class BlenderAnimationEngine:
     
     def _clear_animations(self):
         """Clear existing animations"""
-        for obj in bpy.data.objects:
+        # Only objects this engine animated can carry one of its actions
+        for obj in self._animated_objects:
             if obj.animation_data:
                 obj.animation_data.action = None
+        self._animated_objects.clear()
+    
+    def _assign_action(self, obj, name: str):
+        """Assign this engine's action of that name to obj, creating it only on first use"""
+        action = self._actions.get(name)
+        if action is None:
+            action = self._actions[name] = bpy.data.actions.new(name=name)
+        
+        if not obj.animation_data:
+            obj.animation_data_create()
+        obj.animation_data.action = action
+        self._animated_objects.add(obj)
+        return action
+    
+    def update_lip_sync(self, lip_sync_data: LipSyncData):
+        """Rebuild only the lip-sync animation, leaving gestures and idle motion as they are"""
+        try:
+            self.lip_sync_data = lip_sync_data
+            self._animate_lip_sync(lip_sync_data)
+        except Exception as e:
+            logger.error(f"Failed to update lip-sync: {e}")
+            raise
     
     def _animate_lip_sync(self, lip_sync_data: LipSyncData):
         """Animate lip-sync based on phoneme data"""
         if not lip_sync_data or not self.character_model:
             return
         
-        # Find the snout/mouth object
-        mouth_obj = None
-        for obj in bpy.data.objects:
-            if 'snout' in obj.name.lower() or 'mouth' in obj.name.lower():
-                mouth_obj = obj
-                break
-        
+        # Mouth object is recorded when the character is created or imported
+        mouth_obj = self.mouth_obj
         if not mouth_obj:
             logger.warning("No mouth object found for lip-sync")
             return
         
-        # Create action for mouth animation
-        if not mouth_obj.animation_data:
-            mouth_obj.animation_data_create()
+        # Action for mouth animation
+        action = self._assign_action(mouth_obj, "Lip_Sync")
         
-        action = bpy.data.actions.new(name="Lip_Sync")
-        mouth_obj.animation_data.action = action
+        # Fcurves for mouth animation
+        scale_y_curve = _get_fcurve(action, "scale", 1)  # Y-scale
+        scale_z_curve = _get_fcurve(action, "scale", 2)  # Z-scale
         
-        # Create fcurves for mouth animation
-        scale_y_curve = action.fcurves.new(data_path="scale", index=1)  # Y-scale
-        scale_z_curve = action.fcurves.new(data_path="scale", index=2)  # Z-scale
+        # Calculate mouth shape parameters for every phoneme in one vectorized pass
+        mouth_ids = lip_sync_data.mouth_ids
+        if mouth_ids is None:
+            mouth_category = _MOUTH_CATEGORIES.get
+            mouth_ids = np.fromiter(
+                (mouth_category(shape, MOUTH_REST) for shape in lip_sync_data.mouth_shapes),
+                dtype=np.int8, count=len(lip_sync_data.mouth_shapes)
+            )
+        count = min(len(lip_sync_data.timestamps), len(mouth_ids), len(lip_sync_data.intensities))
+        mouth_ids = mouth_ids[:count]
+        intensities = np.asarray(lip_sync_data.intensities[:count], dtype=np.float32)
         
-        # Animate based on phonemes
-        for i, (timestamp, mouth_shape, intensity) in enumerate(zip(
-            lip_sync_data.timestamps, lip_sync_data.mouth_shapes, lip_sync_data.intensities
-        )):
-            frame = int(timestamp * self.frame_rate)
-            
-            # Calculate mouth shape parameters
-            if mouth_shape in ['A', 'O']:
-                y_scale = 1.0 + (intensity * 0.5)  # Open mouth
-                z_scale = 1.0 + (intensity * 0.3)
-            elif mouth_shape in ['E', 'I']:
-                y_scale = 1.0 + (intensity * 0.3)  # Slightly open
-                z_scale = 1.0 - (intensity * 0.2)
-            elif mouth_shape == 'M':
-                y_scale = 1.0 - (intensity * 0.2)  # Closed mouth
-                z_scale = 1.0
-            else:  # Default/CLOSED
-                y_scale = 1.0
-                z_scale = 1.0
-            
-            # Insert keyframes
-            scale_y_curve.keyframe_points.insert(frame, y_scale)
-            scale_z_curve.keyframe_points.insert(frame, z_scale)
+        frames = (np.asarray(lip_sync_data.timestamps[:count], dtype=np.float64) * self.frame_rate).astype(np.int32)
+        y_scales, z_scales = _mouth_scales(mouth_ids, intensities)
         
-        # Set interpolation mode
-        for fcurve in action.fcurves:
-            for keyframe in fcurve.keyframe_points:
-                keyframe.interpolation = 'LINEAR'
+        # Write all keyframes in one batch per fcurve
+        _set_keyframes(scale_y_curve, frames, y_scales, 'LINEAR')
+        _set_keyframes(scale_z_curve, frames, z_scales, 'LINEAR')
     
     def _animate_gestures(self, animation_cues: List[AnimationCue]):
         """Animate character gestures based on animation cues"""
         if not self.character_model or not animation_cues:
             return
         
-        # Create action for gesture animation
-        if not self.character_model.animation_data:
-            self.character_model.animation_data_create()
+        # Action for gesture animation
+        action = self._assign_action(self.character_model, "Gestures")
         
-        action = bpy.data.actions.new(name="Gestures")
-        self.character_model.animation_data.action = action
+        # Fcurve handles per rotation axis, looked up once
+        curves = {
+            'rx': _get_fcurve(action, "rotation_euler", 0),
+            'ry': _get_fcurve(action, "rotation_euler", 1),
+            'rz': _get_fcurve(action, "rotation_euler", 2),
+        }
         
-        # Create fcurves for rotation
-        rotation_x_curve = action.fcurves.new(data_path="rotation_euler", index=0)
-        rotation_y_curve = action.fcurves.new(data_path="rotation_euler", index=1)
-        rotation_z_curve = action.fcurves.new(data_path="rotation_euler", index=2)
+        # Convert all cues to frame arrays once, then build keys per gesture type
+        start_frames, end_frames, types, intensities = self._cues_to_arrays(animation_cues)
+        
+        # (frames, values) array blocks per rotation axis; each fcurve is written once
+        axis_keys = {axis: [] for axis in curves}
+        for gesture, shapes in GESTURE_KEYFRAMES.items():
+            selected = types == gesture
+            if not selected.any():
+                continue
+            for axis, shape in shapes.items():
+                self._emit_bell_curve(
+                    axis_keys[axis], start_frames[selected], end_frames[selected], intensities[selected], shape
+                )
         
-        for cue in animation_cues:
-            start_frame = int(cue.timestamp * self.frame_rate)
-            end_frame = int((cue.timestamp + cue.duration) * self.frame_rate)
-            
-            # Apply animation based on type
-            if cue.animation_type == 'pointing':
-                self._add_pointing_gesture(rotation_y_curve, start_frame, end_frame, cue.intensity)
-            elif cue.animation_type == 'emphasis':
-                self._add_emphasis_gesture(rotation_x_curve, start_frame, end_frame, cue.intensity)
-            elif cue.animation_type == 'questioning':
-                self._add_questioning_gesture(rotation_z_curve, start_frame, end_frame, cue.intensity)
-            elif cue.animation_type == 'thinking':
-                self._add_thinking_gesture(rotation_x_curve, rotation_y_curve, start_frame, end_frame, cue.intensity)
-        
-        # Set interpolation mode
-        for fcurve in action.fcurves:
-            for keyframe in fcurve.keyframe_points:
-                keyframe.interpolation = 'BEZIER'
-    
-    def _add_pointing_gesture(self, rotation_curve, start_frame: int, end_frame: int, intensity: float):
-        """Add pointing gesture animation"""
-        mid_frame = (start_frame + end_frame) // 2
-        
-        # Keyframes: start -> peak -> end
-        rotation_curve.keyframe_points.insert(start_frame, 0)
-        rotation_curve.keyframe_points.insert(mid_frame, intensity * 0.3)  # 0.3 radians
-        rotation_curve.keyframe_points.insert(end_frame, 0)
-    
-    def _add_emphasis_gesture(self, rotation_curve, start_frame: int, end_frame: int, intensity: float):
-        """Add emphasis gesture animation"""
-        mid_frame = (start_frame + end_frame) // 2
-        
-        # Keyframes: start -> peak -> end
-        rotation_curve.keyframe_points.insert(start_frame, 0)
-        rotation_curve.keyframe_points.insert(mid_frame, intensity * -0.2)  # Slight nod
-        rotation_curve.keyframe_points.insert(end_frame, 0)
-    
-    def _add_questioning_gesture(self, rotation_curve, start_frame: int, end_frame: int, intensity: float):
-        """Add questioning gesture animation"""
-        mid_frame = (start_frame + end_frame) // 2
-        
-        # Keyframes: start -> tilt -> end
-        rotation_curve.keyframe_points.insert(start_frame, 0)
-        rotation_curve.keyframe_points.insert(mid_frame, intensity * 0.2)  # Head tilt
-        rotation_curve.keyframe_points.insert(end_frame, 0)
-    
-    def _add_thinking_gesture(self, rotation_x_curve, rotation_y_curve, start_frame: int, end_frame: int, intensity: float):
-        """Add thinking gesture animation"""
-        quarter_frame = start_frame + (end_frame - start_frame) // 4
-        mid_frame = (start_frame + end_frame) // 2
-        three_quarter_frame = start_frame + 3 * (end_frame - start_frame) // 4
-        
-        # Slow head movement for thinking
-        rotation_x_curve.keyframe_points.insert(start_frame, 0)
-        rotation_x_curve.keyframe_points.insert(quarter_frame, intensity * -0.1)
-        rotation_x_curve.keyframe_points.insert(mid_frame, 0)
-        rotation_x_curve.keyframe_points.insert(three_quarter_frame, intensity * 0.1)
-        rotation_x_curve.keyframe_points.insert(end_frame, 0)
-        
-        rotation_y_curve.keyframe_points.insert(start_frame, 0)
-        rotation_y_curve.keyframe_points.insert(quarter_frame, intensity * 0.15)
-        rotation_y_curve.keyframe_points.insert(mid_frame, 0)
-        rotation_y_curve.keyframe_points.insert(three_quarter_frame, intensity * -0.15)
-        rotation_y_curve.keyframe_points.insert(end_frame, 0)
+        for axis, fcurve in curves.items():
+            blocks = axis_keys[axis]
+            frames = np.concatenate([block_frames for block_frames, _ in blocks]) if blocks else []
+            values = np.concatenate([block_values for _, block_values in blocks]) if blocks else []
+            _set_keyframes(fcurve, frames, values, 'BEZIER')
+    
+    def _cues_to_arrays(self, animation_cues: List[AnimationCue]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Convert cues to (start_frames, end_frames, types, intensities) arrays"""
+        count = len(animation_cues)
+        timestamps = np.fromiter((cue.timestamp for cue in animation_cues), dtype=np.float64, count=count)
+        durations = np.fromiter((cue.duration for cue in animation_cues), dtype=np.float64, count=count)
+        intensities = np.fromiter((cue.intensity for cue in animation_cues), dtype=np.float64, count=count)
+        types = np.array([cue.animation_type for cue in animation_cues])
+        
+        start_frames = (timestamps * self.frame_rate).astype(np.int32)
+        end_frames = ((timestamps + durations) * self.frame_rate).astype(np.int32)
+        return start_frames, end_frames, types, intensities
+    
+    @staticmethod
+    def _emit_bell_curve(axis_keys: List[Tuple[np.ndarray, np.ndarray]], start_frames: np.ndarray,
+                         end_frames: np.ndarray, intensities: np.ndarray, shape: Tuple[Tuple[int, float], ...]):
+        """Append the keys of one gesture shape, for every cue of that gesture, to an axis' key blocks"""
+        positions = np.array([position for position, _ in shape])
+        amplitudes = np.array([amplitude for _, amplitude in shape])
+        
+        # One row per cue, keeping each cue's keys in order
+        frames = start_frames[:, None] + (positions * (end_frames - start_frames)[:, None]) // 4
+        values = intensities[:, None] * amplitudes
+        axis_keys.append((frames.ravel(), values.ravel()))
     
     def _animate_idle_motion(self):
         """Add subtle idle animation for natural movement"""
         if not self.character_model:
             return
         
-        # Add breathing animation
-        if not self.character_model.animation_data:
-            self.character_model.animation_data_create()
-        
-        if not self.character_model.animation_data.action:
-            self.character_model.animation_data.action = bpy.data.actions.new(name="Idle")
-        
-        action = self.character_model.animation_data.action
+        # Add breathing animation to the gesture action, or its own one
+        animation_data = self.character_model.animation_data
+        if animation_data and animation_data.action:
+            action = animation_data.action
+        else:
+            action = self._assign_action(self.character_model, "Idle")
         
-        # Create breathing cycle (scale animation)
-        scale_curve = action.fcurves.new(data_path="scale", index=2)  # Z-scale
+        # Breathing cycle (scale animation)
+        scale_curve = _get_fcurve(action, "scale", 2)  # Z-scale
         
         breathing_cycle = 4.0  # 4 seconds per breath
         end_frame = int(self.scene_duration * self.frame_rate)
+        period = int(breathing_cycle * self.frame_rate)
+        half_period = int(breathing_cycle * self.frame_rate / 2)
         
-        for frame in range(1, end_frame, int(breathing_cycle * self.frame_rate)):
-            # Breathe in
-            scale_curve.keyframe_points.insert(frame, 1.0)
-            scale_curve.keyframe_points.insert(frame + int(breathing_cycle * self.frame_rate / 2), 1.05)
-            scale_curve.keyframe_points.insert(frame + int(breathing_cycle * self.frame_rate), 1.0)
+        # Breathe in/out: rest at each cycle start, peak at the half cycle, rest again at the end
+        cycle_starts = np.arange(1, end_frame, period, dtype=np.float32)
+        frames = np.concatenate([cycle_starts, cycle_starts + half_period, cycle_starts + period])
+        values = np.repeat(np.array([1.0, 1.05, 1.0], dtype=np.float32), len(cycle_starts))
         
-        # Set interpolation mode
-        for keyframe in scale_curve.keyframe_points:
-            keyframe.interpolation = 'BEZIER'
+        _set_keyframes(scale_curve, frames, values, 'BEZIER')
     
     def export_animation(self, output_path: str, format: str = 'fbx') -> str:
         """Export the animated scene"""
@@ -507,13 +789,15 @@ class BlenderAnimationEngine:
             output_file = Path(output_path)
             
             if format.lower() == 'fbx':
+                # Each animated object has a single active action, so baking that one
+                # is enough; exporting every action and NLA strip bakes them all again
                 bpy.ops.export_scene.fbx(
                     filepath=str(output_file.with_suffix('.fbx')),
                     use_selection=False,
                     bake_anim=True,
                     bake_anim_use_all_bones=True,
-                    bake_anim_use_nla_strips=True,
-                    bake_anim_use_all_actions=True
+                    bake_anim_use_nla_strips=False,
+                    bake_anim_use_all_actions=False
                 )
             elif format.lower() == 'blend':
                 bpy.ops.wm.save_as_mainfile(filepath=str(output_file.with_suffix('.blend')))
@@ -0,0 +1,47 @@
+"""
+Concurrency Limits
+Process-wide bounds on concurrent work, shared by every thread and event loop in the process
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ThreadLimit:
+    """
+    Async context manager admitting at most `limit` holders at once across all threads and event loops
+    
+    asyncio.Semaphore belongs to a single loop, while one app serves Streamlit sessions from their own
+    threads and loops; this wraps a threading.BoundedSemaphore instead. A free slot is taken at once;
+    otherwise the blocking acquire runs on the limit's own waiter threads, so waiting neither blocks the
+    event loop nor parks the default executor threads that slot holders need to finish.
+    """
+    
+    def __init__(self, limit: int, name: str = "limit"):
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._waiters = ThreadPoolExecutor(thread_name_prefix=f"{name}-waiter")
+    
+    async def acquire(self):
+        """Wait for a slot without blocking the running event loop"""
+        if self._semaphore.acquire(blocking=False):
+            return
+        
+        waiting = self._waiters.submit(self._semaphore.acquire)
+        try:
+            await asyncio.wrap_future(waiting)
+        except asyncio.CancelledError:
+            # Cancelling cannot interrupt an acquire that has started; give the slot back once it lands
+            waiting.add_done_callback(lambda future: future.cancelled() or self._semaphore.release())
+            raise
+    
+    def release(self):
+        """Free a slot taken by acquire()"""
+        self._semaphore.release()
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
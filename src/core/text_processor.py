@@ -3,16 +3,179 @@ Text Processing Module
 Handles text input preprocessing, language detection, and content analysis
 """
 
+import os
 import re
 import string
+import functools
+import threading
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
+from types import MappingProxyType
+import numpy as np
 from langdetect import detect, DetectorFactory
+from langdetect import detector_factory as langdetect_factory
 from loguru import logger
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
+# Only the langdetect profiles that map to a supported language (see _detect_language), plus
+# Arabic and Persian: without them, Arabic-script text would score as Urdu and become Hindi
+# instead of falling back to English as it did with every profile loaded
+LANGDETECT_PROFILES = ("en", "hi", "mr", "ne", "ur", "ar", "fa")
+
+
+def _init_langdetect_factory():
+    """Replacement for langdetect's init_factory that loads LANGDETECT_PROFILES only"""
+    if langdetect_factory._factory is None:
+        profiles = []
+        for name in LANGDETECT_PROFILES:
+            with open(os.path.join(langdetect_factory.PROFILES_DIRECTORY, name), encoding="utf-8") as f:
+                profiles.append(f.read())
+        
+        factory = DetectorFactory()
+        factory.load_json_profile(profiles)
+        langdetect_factory._factory = factory
+
+
+# detect() looks init_factory up at call time, so profiles still load lazily
+langdetect_factory.init_factory = _init_langdetect_factory
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_cached(text: str) -> str:
+    """langdetect result for a text, memoized (deterministic since the seed is fixed)"""
+    return detect(text)
+
+
+# Curly quotes map to their ASCII forms in a single str.translate pass
+_QUOTE_TABLE = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+
+# Text cleaning in one pass: each alternative's group index selects its replacement
+# (whitespace runs and excessive punctuation)
+_CLEAN_RE = re.compile(r'(\s+)|(\.{3,})|(!{2,})|(\?{2,})')
+_CLEAN_REPLACEMENTS = (None, ' ', '...', '!', '?')
+
+
+def _clean_sub(match: re.Match) -> str:
+    """Replacement for the matched _CLEAN_RE alternative"""
+    return _CLEAN_REPLACEMENTS[match.lastindex]
+
+
+# Precompiled patterns for segmentation
+_SENT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
+# Emotion detection keywords for different languages (shared; treat as read-only)
+EMOTION_KEYWORDS = MappingProxyType({
+    "en": {
+        "happy": ["happy", "joy", "excited", "cheerful", "delighted", "pleased"],
+        "sad": ["sad", "depressed", "unhappy", "sorrow", "grief", "melancholy"],
+        "angry": ["angry", "furious", "mad", "rage", "annoyed", "frustrated"],
+        "surprised": ["surprised", "amazed", "shocked", "astonished", "stunned"],
+        "fear": ["afraid", "scared", "terrified", "worried", "anxious", "nervous"],
+        "neutral": ["said", "stated", "mentioned", "explained", "described"]
+    },
+    "hi": {
+        "happy": ["खुश", "प्रसन्न", "आनंदित", "हर्षित"],
+        "sad": ["दुखी", "उदास", "शोकित", "परेशान"],
+        "angry": ["गुस्सा", "क्रोधित", "नाराज"],
+        "surprised": ["हैरान", "आश्चर्यचकित", "चकित"],
+        "fear": ["डर", "भयभीत", "चिंतित"],
+        "neutral": ["कहा", "बताया", "समझाया"]
+    }
+})
+
+# Keywords that trigger specific animations (shared; treat as read-only)
+ANIMATION_TRIGGERS = MappingProxyType({
+    "en": {
+        "pointing": ["this", "that", "here", "there", "look", "see"],
+        "emphasis": ["important", "remember", "listen", "attention", "focus"],
+        "questioning": ["what", "how", "why", "when", "where", "who"],
+        "explaining": ["because", "therefore", "so", "thus", "hence"],
+        "greeting": ["hello", "hi", "welcome", "greetings"],
+        "thinking": ["think", "consider", "ponder", "reflect", "hmm"]
+    },
+    "hi": {
+        "pointing": ["यह", "वह", "यहाँ", "वहाँ", "देखो", "देखिए"],
+        "emphasis": ["महत्वपूर्ण", "याद रखें", "सुनिए", "ध्यान"],
+        "questioning": ["क्या", "कैसे", "क्यों", "कब", "कहाँ", "कौन"],
+        "explaining": ["क्योंकि", "इसलिए", "अतः"],
+        "greeting": ["नमस्ते", "हैलो", "स्वागत"],
+        "thinking": ["सोचना", "विचार", "हम्म"]
+    }
+})
+
+
+def _build_automaton(keywords: Dict[str, List[str]]):
+    """Aho-Corasick automaton over all keywords of one table (None without pyahocorasick)"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    # Each word maps to every (table order, category) it appears under
+    entries: Dict[str, List[Tuple[int, str]]] = {}
+    rank = 0
+    for category, words in keywords.items():
+        for word in words:
+            entries.setdefault(word, []).append((rank, category))
+            rank += 1
+    
+    automaton = ahocorasick.Automaton()
+    for word, word_entries in entries.items():
+        automaton.add_word(word, (word, word_entries))
+    automaton.make_automaton()
+    return automaton
+
+
+def _find_keywords(automaton, keywords: Dict[str, List[str]], text_lower: str) -> List[Tuple[str, str, int]]:
+    """(category, word, position) of every keyword occurrence, in keyword table order"""
+    if automaton is None:
+        # Cheap substring test first; absent keywords (the common case) cost one C-level scan
+        hits = []
+        find = text_lower.find
+        for category, words in keywords.items():
+            for word in words:
+                position = find(word)
+                while position != -1:
+                    hits.append((category, word, position))
+                    position = find(word, position + len(word))
+        return hits
+    
+    # One scan over the text; keep finditer's non-overlapping matches per word
+    ranked_hits = []
+    next_start: Dict[str, int] = {}
+    for end_index, (word, word_entries) in automaton.iter(text_lower):
+        position = end_index - len(word) + 1
+        if position < next_start.get(word, 0):
+            continue
+        next_start[word] = end_index + 1
+        for rank, category in word_entries:
+            ranked_hits.append((rank, position, category, word))
+    
+    ranked_hits.sort()
+    return [(category, word, position) for _, position, category, word in ranked_hits]
+
+
+# The keyword tables are static, so each automaton is built once per process
+# and shared by every TextProcessor instance
+@functools.lru_cache(maxsize=None)
+def _emotion_automaton(language: str):
+    """Shared automaton over EMOTION_KEYWORDS[language]"""
+    return _build_automaton(EMOTION_KEYWORDS[language])
+
+
+@functools.lru_cache(maxsize=None)
+def _animation_automaton(language: str):
+    """Shared automaton over ANIMATION_TRIGGERS[language]"""
+    return _build_automaton(ANIMATION_TRIGGERS[language])
+
 
 @dataclass
 class ProcessedText:
@@ -29,6 +192,14 @@ class ProcessedText:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class _SpacyAnalysis:
+    """Everything process_text needs from one spaCy pass over the text"""
+    words: List[str]
+    sentence_count: int
+    alpha_lengths: np.ndarray  # Length of each alphabetic token
+
+
 class TextProcessor:
     """Advanced text processing for multilingual text-to-video conversion"""
     
@@ -37,16 +208,37 @@ class TextProcessor:
         self.nlp_models = {"en": None, "hi": None}  # Initialize nlp_models
         self._setup_emotion_keywords()
         self._setup_animation_triggers()
+        
+        # Load language profiles (and warm any NLP model) off the calling thread
+        threading.Thread(target=self._warm_up, daemon=True).start()
+    
+    def _warm_up(self):
+        """Pay one-time initialization costs before the first request needs them"""
+        try:
+            _init_langdetect_factory()
+            for nlp in self.nlp_models.values():
+                if nlp:
+                    nlp("warmup")
+        except Exception as e:
+            logger.debug(f"Text processor warm-up skipped: {e}")
     
     def _load_nlp_models(self):
         """Load spaCy NLP models for supported languages"""
         self.nlp_models = {}
         
         try:
-            # English model
-            self.nlp_models["en"] = spacy.load("en_core_web_sm")
+            import spacy
+            
+            # English model: only tokenization and sentence boundaries are used
+            # (token.text/is_space/is_alpha and doc.sents), so skip the heavy
+            # statistical pipes and split sentences with the rule-based sentencizer
+            self.nlp_models["en"] = spacy.load(
+                "en_core_web_sm",
+                exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+            )
+            self.nlp_models["en"].add_pipe("sentencizer")
             logger.info("Loaded English NLP model")
-        except OSError:
+        except (ImportError, OSError):
             logger.warning("English spaCy model not found. Install with: python -m spacy download en_core_web_sm")
             self.nlp_models["en"] = None
         
@@ -56,45 +248,11 @@ class TextProcessor:
         
     def _setup_emotion_keywords(self):
         """Setup emotion detection keywords for different languages"""
-        self.emotion_keywords = {
-            "en": {
-                "happy": ["happy", "joy", "excited", "cheerful", "delighted", "pleased"],
-                "sad": ["sad", "depressed", "unhappy", "sorrow", "grief", "melancholy"],
-                "angry": ["angry", "furious", "mad", "rage", "annoyed", "frustrated"],
-                "surprised": ["surprised", "amazed", "shocked", "astonished", "stunned"],
-                "fear": ["afraid", "scared", "terrified", "worried", "anxious", "nervous"],
-                "neutral": ["said", "stated", "mentioned", "explained", "described"]
-            },
-            "hi": {
-                "happy": ["खुश", "प्रसन्न", "आनंदित", "हर्षित"],
-                "sad": ["दुखी", "उदास", "शोकित", "परेशान"],
-                "angry": ["गुस्सा", "क्रोधित", "नाराज"],
-                "surprised": ["हैरान", "आश्चर्यचकित", "चकित"],
-                "fear": ["डर", "भयभीत", "चिंतित"],
-                "neutral": ["कहा", "बताया", "समझाया"]
-            }
-        }
+        self.emotion_keywords = EMOTION_KEYWORDS
     
     def _setup_animation_triggers(self):
         """Setup keywords that trigger specific animations"""
-        self.animation_triggers = {
-            "en": {
-                "pointing": ["this", "that", "here", "there", "look", "see"],
-                "emphasis": ["important", "remember", "listen", "attention", "focus"],
-                "questioning": ["what", "how", "why", "when", "where", "who"],
-                "explaining": ["because", "therefore", "so", "thus", "hence"],
-                "greeting": ["hello", "hi", "welcome", "greetings"],
-                "thinking": ["think", "consider", "ponder", "reflect", "hmm"]
-            },
-            "hi": {
-                "pointing": ["यह", "वह", "यहाँ", "वहाँ", "देखो", "देखिए"],
-                "emphasis": ["महत्वपूर्ण", "याद रखें", "सुनिए", "ध्यान"],
-                "questioning": ["क्या", "कैसे", "क्यों", "कब", "कहाँ", "कौन"],
-                "explaining": ["क्योंकि", "इसलिए", "अतः"],
-                "greeting": ["नमस्ते", "हैलो", "स्वागत"],
-                "thinking": ["सोचना", "विचार", "हम्म"]
-            }
-        }
+        self.animation_triggers = ANIMATION_TRIGGERS
     
     async def process_text(
         self, 
@@ -129,9 +287,10 @@ class TextProcessor:
                 logger.warning(f"Language {detected_lang} not fully supported, using English")
                 detected_lang = "en"
             
-            # Sentence and word segmentation
+            # Sentence and word segmentation (one spaCy pass serves words and complexity)
+            analysis = self._spacy_analyze(cleaned_text, detected_lang)
             sentences = self._segment_sentences(cleaned_text, detected_lang)
-            words = self._extract_words(cleaned_text, detected_lang)
+            words = analysis.words if analysis else self._extract_words(cleaned_text, detected_lang)
             
             # Emotion analysis
             emotion_cues = self._analyze_emotions(cleaned_text, detected_lang)
@@ -147,7 +306,9 @@ class TextProcessor:
                 "word_count": len(words),
                 "sentence_count": len(sentences),
                 "estimated_duration": timing_info.get("total_duration", 0),
-                "complexity_score": self._calculate_complexity(cleaned_text, detected_lang)
+                "complexity_score": self._calculate_complexity(
+                    cleaned_text, detected_lang, words=words, sentences=sentences, analysis=analysis
+                )
             }
             
             return ProcessedText(
@@ -169,24 +330,13 @@ class TextProcessor:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Handle special characters
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        # Remove excessive punctuation
-        text = re.sub(r'[.]{3,}', '...', text)
-        text = re.sub(r'[!]{2,}', '!', text)
-        text = re.sub(r'[?]{2,}', '?', text)
-        
-        return text
+        # Normalize quotes, then collapse whitespace and trim excessive punctuation in one scan
+        return _CLEAN_RE.sub(_clean_sub, text.strip().translate(_QUOTE_TABLE))
     
     def _detect_language(self, text: str) -> Tuple[str, float]:
         """Detect text language with confidence score"""
         try:
-            detected = detect(text)
+            detected = _detect_cached(text)
             # Map detected language to supported languages
             lang_mapping = {
                 'en': 'en',
@@ -209,18 +359,30 @@ class TextProcessor:
     def _segment_sentences(self, text: str, language: str) -> List[str]:
         """Segment text into sentences"""
         # Basic sentence segmentation
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENT_RE.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
+    def _spacy_analyze(self, text: str, language: str) -> Optional[_SpacyAnalysis]:
+        """Words, sentence count and alphabetic token lengths from a single spaCy pass"""
+        if language != "en" or not self.nlp_models["en"]:
+            return None
+        
+        doc = self.nlp_models["en"](text)
+        return _SpacyAnalysis(
+            words=[token.text for token in doc if not token.is_space],
+            sentence_count=sum(1 for _ in doc.sents),
+            alpha_lengths=np.fromiter((len(token.text) for token in doc if token.is_alpha), dtype=np.int32)
+        )
+    
     def _extract_words(self, text: str, language: str) -> List[str]:
         """Extract words from text"""
-        if language == "en" and self.nlp_models["en"]:
+        analysis = self._spacy_analyze(text, language)
+        if analysis:
             # Use spaCy for English
-            doc = self.nlp_models["en"](text)
-            return [token.text for token in doc if not token.is_space]
+            return analysis.words
         else:
             # Basic word extraction
-            words = re.findall(r'\b\w+\b', text)
+            words = _WORD_RE.findall(text)
             return words
     
     def _analyze_emotions(self, text: str, language: str) -> List[Dict[str, Any]]:
@@ -231,18 +393,14 @@ class TextProcessor:
         if language in self.emotion_keywords:
             keywords = self.emotion_keywords[language]
             
-            for emotion, words in keywords.items():
-                for word in words:
-                    if word in text_lower:
-                        # Find position of the word
-                        positions = [m.start() for m in re.finditer(re.escape(word), text_lower)]
-                        for pos in positions:
-                            emotions.append({
-                                "emotion": emotion,
-                                "word": word,
-                                "position": pos,
-                                "confidence": 0.7
-                            })
+            # Find every keyword position in one pass over the text
+            for emotion, word, pos in _find_keywords(_emotion_automaton(language), keywords, text_lower):
+                emotions.append({
+                    "emotion": emotion,
+                    "word": word,
+                    "position": pos,
+                    "confidence": 0.7
+                })
         
         return emotions
     
@@ -254,18 +412,14 @@ class TextProcessor:
         if language in self.animation_triggers:
             triggers = self.animation_triggers[language]
             
-            for animation_type, words in triggers.items():
-                for word in words:
-                    if word in text_lower:
-                        positions = [m.start() for m in re.finditer(re.escape(word), text_lower)]
-                        for pos in positions:
-                            cues.append({
-                                "animation_type": animation_type,
-                                "trigger_word": word,
-                                "position": pos,
-                                "duration": 2.0,  # Default 2 seconds
-                                "intensity": 0.8
-                            })
+            for animation_type, word, pos in _find_keywords(_animation_automaton(language), triggers, text_lower):
+                cues.append({
+                    "animation_type": animation_type,
+                    "trigger_word": word,
+                    "position": pos,
+                    "duration": 2.0,  # Default 2 seconds
+                    "intensity": 0.8
+                })
         
         return cues
     
@@ -297,26 +451,36 @@ class TextProcessor:
             "sentences": len(sentences)
         }
     
-    def _calculate_complexity(self, text: str, language: str) -> float:
-        """Calculate text complexity score (0-1)"""
-        if language == "en" and self.nlp_models["en"]:
-            doc = self.nlp_models["en"](text)
-            
+    def _calculate_complexity(
+        self,
+        text: str,
+        language: str,
+        words: Optional[List[str]] = None,
+        sentences: Optional[List[str]] = None,
+        analysis: Optional[_SpacyAnalysis] = None
+    ) -> float:
+        """Calculate text complexity score (0-1), reusing already computed segmentation when given"""
+        if analysis is None:
+            analysis = self._spacy_analyze(text, language)
+        
+        if analysis:
             # Factors for complexity
-            avg_word_length = sum(len(token.text) for token in doc if token.is_alpha) / max(1, len([t for t in doc if t.is_alpha]))
-            sentence_count = len(list(doc.sents))
-            word_count = len([t for t in doc if t.is_alpha])
-            avg_sentence_length = word_count / max(1, sentence_count)
+            alpha_lengths = analysis.alpha_lengths
+            avg_word_length = float(alpha_lengths.mean()) if alpha_lengths.size else 0.0
+            avg_sentence_length = alpha_lengths.size / max(1, analysis.sentence_count)
             
             # Normalize complexity (0-1 scale)
             complexity = min(1.0, (avg_word_length * avg_sentence_length) / 100)
             return complexity
         else:
             # Basic complexity for other languages
-            words = self._extract_words(text, language)
-            sentences = self._segment_sentences(text, language)
+            if words is None:
+                words = self._extract_words(text, language)
+            if sentences is None:
+                sentences = self._segment_sentences(text, language)
             
-            avg_word_length = sum(len(word) for word in words) / max(1, len(words))
+            word_lengths = np.fromiter((len(word) for word in words), dtype=np.int32, count=len(words))
+            avg_word_length = float(word_lengths.mean()) if word_lengths.size else 0.0
             avg_sentence_length = len(words) / max(1, len(sentences))
             
             complexity = min(1.0, (avg_word_length * avg_sentence_length) / 80)
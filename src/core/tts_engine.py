@@ -4,13 +4,17 @@ Handles multilingual speech generation with multiple TTS backends
 """
 
 import os
+import json
 import asyncio
 import hashlib
+import functools
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 import io
 import tempfile
+import threading
+from collections import OrderedDict
 
 # TTS Libraries
 import gtts
@@ -27,14 +31,86 @@ import soundfile as sf
 from pydub import AudioSegment
 import numpy as np
 from loguru import logger
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from config.settings import settings
+from src.core.concurrency import ThreadLimit
+
+
+def _read_wav(path: str, sample_rate: int) -> Tuple[np.ndarray, int]:
+    """Read a WAV file as mono float32 at sample_rate, resampling only when the rates differ"""
+    audio, file_rate = sf.read(path, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)  # Downmix like librosa.load
+    if file_rate != sample_rate:
+        audio = librosa.resample(audio, orig_sr=file_rate, target_sr=sample_rate)
+    return audio, sample_rate
+
+
+@functools.lru_cache(maxsize=8)
+def _fade_ramps(fade_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Shared read-only fade-in/fade-out ramps (one pair per sample rate in practice)"""
+    fade_in = np.linspace(0, 1, fade_samples, dtype=np.float32)
+    fade_out = np.linspace(1, 0, fade_samples, dtype=np.float32)
+    fade_in.flags.writeable = False
+    fade_out.flags.writeable = False
+    return fade_in, fade_out
+
+
+def _normalize_and_fade_numpy(audio: np.ndarray, fade_samples: int, tiny: float) -> np.ndarray:
+    """Peak-normalize audio, then apply linear fade-in/out (NumPy fallback)"""
+    peak = np.abs(audio).max(initial=0.0)
+    audio = audio / peak if peak >= tiny else audio.copy()
+    if fade_samples > 0 and len(audio) > fade_samples * 2:
+        fade_in, fade_out = _fade_ramps(fade_samples)
+        audio[:fade_samples] *= fade_in
+        audio[-fade_samples:] *= fade_out
+    return audio
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _normalize_and_fade_jit(audio, fade_samples, tiny):
+        """Peak-normalize audio and apply linear fade-in/out in a single fused pass"""
+        count = audio.shape[0]
+        peak = 0.0
+        for i in range(count):
+            value = abs(audio[i])
+            if value > peak:
+                peak = value
+        scale = 1.0 / peak if peak >= tiny else 1.0
+        
+        fade = fade_samples > 0 and count > fade_samples * 2
+        fade_end = max(fade_samples - 1, 1)
+        fade_out_start = count - fade_samples
+        out = np.empty_like(audio)
+        for i in range(count):
+            gain = scale
+            if fade:
+                if i < fade_samples:
+                    gain *= i / fade_end
+                elif i >= fade_out_start:
+                    gain *= 1.0 - (i - fade_out_start) / fade_end
+            out[i] = audio[i] * gain
+        return out
+
+
+def _normalize_and_fade(audio: np.ndarray, fade_samples: int) -> np.ndarray:
+    """Peak-normalize audio (as librosa.util.normalize) and apply linear fades, into a new array"""
+    tiny = float(np.finfo(audio.dtype).tiny)
+    if NUMBA_AVAILABLE:
+        return _normalize_and_fade_jit(audio, fade_samples, tiny)
+    return _normalize_and_fade_numpy(audio, fade_samples, tiny)
 
 
 @dataclass
 class AudioData:
     """Data class for audio information"""
-    audio_array: np.ndarray
+    audio_array: np.ndarray  # mono float32 samples in [-1, 1]
     sample_rate: int
     duration: float
     file_path: Optional[str] = None
@@ -49,10 +125,28 @@ class TTSEngine:
     def __init__(self):
         self.cache_dir = settings.TTS_CACHE_DIR
         self.cache_enabled = settings.TTS_CACHE_ENABLED
+        # Most recently used cache entries, so back-to-back repeats skip the disk read
+        self._memory_cache: "OrderedDict[str, AudioData]" = OrderedDict()
+        self._memory_lock = threading.Lock()
         self.supported_engines = ["gtts", "pyttsx3"]
+        # pyttsx3 engines are not thread-safe; synthesis runs in executor threads
+        self._pyttsx3_lock = threading.Lock()
+        # Per-engine concurrency limits, shared by every thread and event loop using this engine
+        self._engine_slots = {
+            "gtts": ThreadLimit(settings.TTS_GTTS_MAX_CONCURRENCY, "gtts"),
+            "pyttsx3": ThreadLimit(1, "pyttsx3"),
+            "coqui": ThreadLimit(1, "coqui")
+        }
         
         if COQUI_AVAILABLE:
             self.supported_engines.append("coqui")
+        
+        # Compile (or load from numba's on-disk cache) the post-processing kernel
+        # in the background while the TTS backends initialize
+        if NUMBA_AVAILABLE:
+            threading.Thread(
+                target=_normalize_and_fade, args=(np.zeros(16, dtype=np.float32), 4), daemon=True
+            ).start()
             
         self._initialize_engines()
         logger.info(f"TTS Engine initialized with backends: {self.supported_engines}")
@@ -180,18 +274,19 @@ class TTSEngine:
             # Generate speech
             tts = gtts.gTTS(text=text, lang=gtts_lang, tld=tld, slow=slow)
             
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_file:
-                tts.save(temp_file.name)
-                temp_path = temp_file.name
+            # Fetch the MP3 into memory (network-bound, so off the event loop)
+            # with a cap on simultaneous requests
+            mp3_buffer = io.BytesIO()
+            async with self._engine_slots["gtts"]:
+                await asyncio.get_running_loop().run_in_executor(None, tts.write_to_fp, mp3_buffer)
+            mp3_buffer.seek(0)
             
-            # Load audio data
-            audio_array, sample_rate = librosa.load(temp_path, sr=settings.AUDIO_SETTINGS["sample_rate"])
+            # Load audio data (MP3 needs librosa's decoder; resample with the faster soxr preset)
+            audio_array, sample_rate = librosa.load(
+                mp3_buffer, sr=settings.AUDIO_SETTINGS["sample_rate"], dtype=np.float32, res_type="soxr_mq"
+            )
             duration = len(audio_array) / sample_rate
             
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
             return AudioData(
                 audio_array=audio_array,
                 sample_rate=sample_rate,
@@ -215,12 +310,18 @@ class TTSEngine:
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
                 temp_path = temp_file.name
             
-            # Generate speech
-            engine.save_to_file(text, temp_path)
-            engine.runAndWait()
+            # Generate speech without blocking the event loop
+            def synthesize():
+                with self._pyttsx3_lock:
+                    engine.save_to_file(text, temp_path)
+                    engine.runAndWait()
+            
+            # Waiting requests queue here instead of parking executor threads on the lock
+            async with self._engine_slots["pyttsx3"]:
+                await asyncio.get_running_loop().run_in_executor(None, synthesize)
             
             # Load audio data
-            audio_array, sample_rate = librosa.load(temp_path, sr=settings.AUDIO_SETTINGS["sample_rate"])
+            audio_array, sample_rate = _read_wav(temp_path, settings.AUDIO_SETTINGS["sample_rate"])
             duration = len(audio_array) / sample_rate
             
             # Clean up temporary file
@@ -249,11 +350,15 @@ class TTSEngine:
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
                 temp_path = temp_file.name
             
-            # Coqui TTS generation (simplified)
-            tts.tts_to_file(text=text, file_path=temp_path)
+            # Coqui TTS generation (simplified), run off the event loop one request at a
+            # time so concurrent calls do not contend for the model's (GPU) memory
+            async with self._engine_slots["coqui"]:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(tts.tts_to_file, text=text, file_path=temp_path)
+                )
             
             # Load audio data
-            audio_array, sample_rate = librosa.load(temp_path, sr=settings.AUDIO_SETTINGS["sample_rate"])
+            audio_array, sample_rate = _read_wav(temp_path, settings.AUDIO_SETTINGS["sample_rate"])
             duration = len(audio_array) / sample_rate
             
             # Clean up temporary file
@@ -275,22 +380,16 @@ class TTSEngine:
         try:
             audio = audio_data.audio_array
             
-            # Normalize audio levels
-            audio = librosa.util.normalize(audio)
-            
             # Apply gentle noise reduction (basic)
             # For more advanced noise reduction, consider using noisereduce library
             
-            # Trim silence from beginning and end
+            # Trim silence from beginning and end; the threshold is relative to the
+            # peak, so trimming before normalization keeps the same samples
             audio, _ = librosa.effects.trim(audio, top_db=20)
             
-            # Add small fade-in and fade-out
+            # Normalize audio levels and add small fade-in and fade-out in one pass
             fade_samples = int(0.1 * audio_data.sample_rate)  # 100ms fade
-            if len(audio) > fade_samples * 2:
-                # Fade in
-                audio[:fade_samples] *= np.linspace(0, 1, fade_samples)
-                # Fade out
-                audio[-fade_samples:] *= np.linspace(1, 0, fade_samples)
+            audio = _normalize_and_fade(audio, fade_samples)
             
             # Extract phoneme information for lip-sync
             phonemes = await self._extract_phonemes(audio, audio_data.sample_rate)
@@ -316,12 +415,16 @@ class TTSEngine:
             # - Festival Speech Synthesis System
             # - MaryTTS
             
-            # Basic onset detection as a placeholder
-            onset_frames = librosa.onset.onset_detect(
-                y=audio,
-                sr=sample_rate,
-                units='time'
-            )
+            # Basic onset detection as a placeholder: local maxima of a 20ms RMS
+            # envelope that rise above its mean (no STFT needed)
+            hop = max(1, int(0.02 * sample_rate))
+            frames = audio[:len(audio) // hop * hop].reshape(-1, hop)
+            onset_frames = np.empty(0)
+            if len(frames) >= 3:
+                rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+                inner = rms[1:-1]
+                peaks = np.flatnonzero((inner > rms[:-2]) & (inner > rms[2:]) & (inner > rms.mean())) + 1
+                onset_frames = peaks * hop / sample_rate
             
             # Convert to phoneme-like data structure
             phonemes = []
@@ -351,18 +454,30 @@ class TTSEngine:
         """Check if audio is cached"""
         try:
             cache_key = self._generate_cache_key(text, language, voice_style, engine)
-            cache_file = self.cache_dir / f"{cache_key}.npz"
+            # The engine is shared across session threads, so the LRU is only touched under its lock
+            with self._memory_lock:
+                if cache_key in self._memory_cache:
+                    self._memory_cache.move_to_end(cache_key)
+                    return self._memory_cache[cache_key]
+            
+            cache_file = self.cache_dir / f"{cache_key}.wav"
+            info_file = cache_file.with_suffix(".json")
             
-            if cache_file.exists():
+            # The JSON sidecar is written last, so its presence marks a complete entry
+            if info_file.exists() and cache_file.exists():
                 # Load cached audio
-                data = np.load(cache_file, allow_pickle=True)
-                return AudioData(
-                    audio_array=data['audio_array'],
-                    sample_rate=int(data['sample_rate']),
-                    duration=float(data['duration']),
-                    phonemes=data.get('phonemes', []).tolist() if 'phonemes' in data else [],
-                    metadata=data.get('metadata', {}).item() if 'metadata' in data else {}
+                with open(info_file, "r", encoding="utf-8") as f:
+                    info = json.load(f)
+                audio_array, sample_rate = sf.read(cache_file, dtype="float32")
+                audio_data = AudioData(
+                    audio_array=audio_array,
+                    sample_rate=sample_rate,
+                    duration=float(info["duration"]),
+                    phonemes=info.get("phonemes", []),
+                    metadata=info.get("metadata", {})
                 )
+                self._remember(cache_key, audio_data)
+                return audio_data
         except Exception as e:
             logger.warning(f"Cache check failed: {e}")
         
@@ -372,27 +487,53 @@ class TTSEngine:
         """Cache generated audio"""
         try:
             cache_key = self._generate_cache_key(text, language, voice_style, engine)
-            cache_file = self.cache_dir / f"{cache_key}.npz"
-            
-            # Save audio data
-            np.savez_compressed(
-                cache_file,
-                audio_array=audio_data.audio_array,
-                sample_rate=audio_data.sample_rate,
-                duration=audio_data.duration,
-                phonemes=audio_data.phonemes or [],
-                metadata=audio_data.metadata or {}
+            cache_file = self.cache_dir / f"{cache_key}.wav"
+            info_file = cache_file.with_suffix(".json")
+            self._remember(cache_key, audio_data)
+            
+            # Save audio as raw float32 WAV, with a JSON sidecar for the rest; each file is written
+            # under a temporary name and renamed, so concurrent readers never see a partial entry
+            tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_wav = cache_file.with_name(cache_file.name + tmp_suffix)
+            sf.write(
+                tmp_wav,
+                np.asarray(audio_data.audio_array, dtype=np.float32),
+                audio_data.sample_rate,
+                subtype="FLOAT",
+                format="WAV"
             )
+            os.replace(tmp_wav, cache_file)
+            
+            tmp_info = info_file.with_name(info_file.name + tmp_suffix)
+            with open(tmp_info, "w", encoding="utf-8") as f:
+                json.dump({
+                    "duration": audio_data.duration,
+                    "phonemes": audio_data.phonemes or [],
+                    "metadata": audio_data.metadata or {}
+                }, f)
+            os.replace(tmp_info, info_file)
             
             logger.debug(f"Audio cached: {cache_file}")
             
         except Exception as e:
             logger.warning(f"Audio caching failed: {e}")
     
+    def _remember(self, cache_key: str, audio_data: AudioData):
+        """Keep an entry in the in-memory LRU, evicting the least recently used"""
+        with self._memory_lock:
+            self._memory_cache[cache_key] = audio_data
+            self._memory_cache.move_to_end(cache_key)
+            while len(self._memory_cache) > settings.TTS_MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
     def _generate_cache_key(self, text: str, language: str, voice_style: str, engine: str) -> str:
         """Generate cache key for audio"""
-        cache_string = f"{text}_{language}_{voice_style}_{engine}"
-        return hashlib.md5(cache_string.encode()).hexdigest()
+        # Hash the fields separately (NUL-delimited) instead of concatenating the text
+        digest = hashlib.blake2b(digest_size=16)
+        for field in (text, language, voice_style, engine):
+            digest.update(field.encode())
+            digest.update(b"\x00")
+        return digest.hexdigest()
     
     async def save_audio(self, audio_data: AudioData, output_path: str, format: str = "wav") -> str:
         """Save audio data to file"""
@@ -408,9 +549,10 @@ class TTSEngine:
                     format='WAV'
                 )
             elif format.lower() == "mp3":
-                # Convert to AudioSegment for MP3 export
+                # Convert to AudioSegment for MP3 export (16-bit PCM, matching sample_width)
+                pcm = (np.clip(audio_data.audio_array, -1.0, 1.0) * 32767).astype(np.int16)
                 audio_segment = AudioSegment(
-                    audio_data.audio_array.tobytes(),
+                    pcm.tobytes(),
                     frame_rate=audio_data.sample_rate,
                     sample_width=2,
                     channels=1
@@ -3,12 +3,18 @@ Video Renderer Module
 Handles video generation, compositing, and effects for text-to-video platform
 """
 
+import asyncio
 import cv2
 import numpy as np
 import subprocess
 import tempfile
 import os
-from typing import Dict, List, Optional, Tuple, Any
+import re
+import shutil
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Coroutine, Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass
 from pathlib import Path
 import json
@@ -16,6 +22,216 @@ import wave
 import threading
 import time
 from loguru import logger
+from PIL import Image
+
+try:
+    from numba import config as numba_config, njit, prange
+    NUMBA_AVAILABLE = True
+    if "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+        # Parallel kernels launch from a worker thread (see _FUSED_EFFECTS_THREAD); TBB's workers
+        # can then hang the interpreter at exit, which OpenMP and the workqueue layer do not
+        numba_config.THREADING_LAYER_PRIORITY = ["omp", "workqueue", "tbb"]
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Blender writes uncompressed frames, so neither post-processing nor FFmpeg pays for PNG coding
+FRAME_FORMAT = "BMP"
+FRAME_EXTENSION = "bmp"
+
+# Blender reports the frame being rendered as "Fra:<n>" and each written frame as "Saved: '<path>'"
+_BLENDER_FRAME_RE = re.compile(r"Fra:\s*(\d+)")
+_BLENDER_SAVED_RE = re.compile(r"Saved: '(.+?)'")
+
+# Rendered frames go to tmpfs when it has room for this many seconds of video at the configured size
+SHM_DIR = Path("/dev/shm")
+SHM_MIN_SECONDS = 60
+
+# Hardware H.264 encoders in order of preference
+HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_vaapi")
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# FFmpeg reports progress as key=value lines on stdout, leaving stderr for errors only
+FFMPEG_PROGRESS_ARGS = ("-hide_banner", "-loglevel", "error", "-nostats", "-progress", "pipe:1")
+
+# Frames loaded and post-processed together
+POST_EFFECT_BATCH_SIZE = 32
+
+# Per-pixel effects with constant parameters run once over a whole (N, H, W, 3) batch
+BATCHED_EFFECTS = frozenset({'fade_in', 'fade_out', 'color_correction', 'vignette'})
+
+
+# Largest kernel accepted by OpenCV's CUDA separable filters
+CUDA_MAX_KERNEL_SIZE = 31
+
+# GPU frames in flight: while the device works on one, the host stages the next
+CUDA_PIPELINE_DEPTH = 2
+
+
+def _hw_device_args(encoder: Optional[str]) -> List[str]:
+    """Global FFmpeg options (before the inputs) needed by a hardware encoder"""
+    return ["-vaapi_device", VAAPI_DEVICE] if encoder == "h264_vaapi" else []
+
+
+def _hw_encoder_args(encoder: str, bitrate: str, filters: Optional[List[str]] = None,
+                     on_device: bool = False) -> List[str]:
+    """FFmpeg encoder, filter and pixel format options for a hardware encoder (see _video_encoder_args)"""
+    filters = list(filters or [])
+    pix_fmt = None if on_device else "yuv420p"
+    
+    if encoder == "h264_nvenc":
+        args = ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq", "-rc", "vbr", "-b:v", bitrate]
+    elif encoder == "h264_qsv":
+        args = ["-c:v", "h264_qsv", "-b:v", bitrate, "-async_depth", "4"]
+        pix_fmt = "nv12"
+    else:
+        # Frames are uploaded to the VAAPI device, with several encodes in flight
+        args = ["-c:v", "h264_vaapi", "-b:v", bitrate, "-async_depth", "4"]
+        if not on_device:
+            filters += ["format=nv12", "hwupload"]
+        pix_fmt = None
+    
+    if filters:
+        args += ["-vf", ",".join(filters)]
+    if pix_fmt:
+        args += ["-pix_fmt", pix_fmt]
+    return args
+
+
+@functools.lru_cache(maxsize=None)
+def _which(program: str) -> Optional[str]:
+    """Path of an executable on PATH, looked up once per process"""
+    return shutil.which(program)
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_filters(ffmpeg_path: str) -> frozenset:
+    """Names of the filters this FFmpeg build provides"""
+    try:
+        listed = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-filters"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    # Rows look like " TSC name   V->V   Description"
+    return frozenset(parts[1] for parts in map(str.split, listed.splitlines()) if len(parts) > 2 and "->" in parts[2])
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_hw_encoder(ffmpeg_path: str) -> Optional[str]:
+    """First hardware H.264 encoder that FFmpeg lists and that can actually encode on this machine"""
+    try:
+        listed = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    
+    for encoder in HW_ENCODERS:
+        if encoder not in listed:
+            continue
+        
+        # Being compiled in says nothing about a usable device, so try a tiny encode with the
+        # options real encodes use; an encoder can accept its defaults yet reject those
+        cmd = [
+            ffmpeg_path, "-hide_banner", "-v", "error",
+            *_hw_device_args(encoder),
+            "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+            *_hw_encoder_args(encoder, "1M"),
+            "-f", "null", "-"
+        ]
+        try:
+            if subprocess.run(cmd, capture_output=True, timeout=30).returncode == 0:
+                return encoder
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return None
+
+
+def _cuda_available() -> bool:
+    """Whether OpenCV was built with CUDA and sees a device"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _run_sync(coro: Coroutine) -> Any:
+    """Run a coroutine to completion from blocking code, also when called inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run cannot nest, so the coroutine gets its own loop on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+async def _abatched(items: AsyncIterator, size: int) -> AsyncIterator[List]:
+    """Group the items of an async iterator into lists of up to size"""
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _image_size(path: str) -> Tuple[int, int]:
+    """Width and height of an image file, read from its header"""
+    with Image.open(path) as image:
+        return image.size
+
+
+def _as_image(frames: np.ndarray) -> np.ndarray:
+    """Frame or (N, H, W, C) batch viewed as one tall image, for per-pixel OpenCV calls"""
+    return frames.reshape(-1, *frames.shape[-2:])
+
+
+def _shift_columns(frame: np.ndarray, dx: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Frame translated by dx whole columns (positive moves the content right), exposed columns black"""
+    result = np.empty_like(frame) if out is None else out
+    width = frame.shape[1]
+    dx = max(-width, min(width, dx))
+    if dx >= 0:
+        result[:, dx:] = frame[:, :width - dx]
+        result[:, :dx] = 0
+    else:
+        result[:, :width + dx] = frame[:, -dx:]
+        result[:, width + dx:] = 0
+    return result
+
+
+# Step kinds of the fused per-pixel kernel
+STEP_SCALE_ABS = 0  # |value * gain + bias|, rounded (cv2.convertScaleAbs: fades, brightness/contrast)
+STEP_MASK = 1       # value * mask[y, x], truncated (vignette)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fused_pixel_effects(frames, kinds, gains, biases, mask_ids, masks):
+        """Apply a chain of per-pixel steps to a (N, H, W, C) uint8 batch in place, reading and writing each pixel once"""
+        count, height, width, channels = frames.shape
+        for row in prange(count * height):
+            n = row // height
+            y = row % height
+            for x in range(width):
+                for c in range(channels):
+                    value = np.float32(frames[n, y, x, c])
+                    for step in range(kinds.shape[0]):
+                        kind = kinds[step]
+                        if kind == STEP_MASK:
+                            value = np.float32(np.floor(value * masks[mask_ids[step], y, x]))
+                        else:
+                            value = np.float32(np.rint(abs(value * gains[step] + biases[step])))
+                        value = min(max(value, np.float32(0.0)), np.float32(255.0))
+                    frames[n, y, x, c] = np.uint8(value)
+    
+    # The fused kernel runs off the event loop, always on this one thread: the workqueue threading
+    # layer does not support launches from several threads at once
+    _FUSED_EFFECTS_THREAD = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fused-effects")
 
 
 @dataclass
@@ -28,6 +244,43 @@ class VideoConfig:
     codec: str = "h264"
     format: str = "mp4"
     quality: str = "high"
+    preset: str = "veryfast"  # x264 speed/size trade-off
+    tune: Optional[str] = None  # e.g. "animation", "film"
+    threads: int = 0  # Encoder threads, 0 = auto
+    x264_params: str = ""  # Extra libx264 options, e.g. "sliced-threads=1:sync-lookahead=0"
+    hardware_encoding: bool = True  # Use NVENC/QSV/VAAPI for H.264 when the machine has one
+
+
+class _CudaSlot:
+    """Pinned host buffers and reusable device frames for one GPU frame in flight"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.done = cv2.cuda.Event()
+        self.gpu_frame = cv2.cuda_GpuMat()
+        self._scratch: List[Any] = []
+        self._pinned: Dict[Tuple, np.ndarray] = {}
+    
+    def scratch(self, index: int) -> Any:
+        """Device buffer for an intermediate result; reused, so kernels allocate nothing per frame"""
+        while len(self._scratch) <= index:
+            self._scratch.append(cv2.cuda_GpuMat())
+        return self._scratch[index]
+    
+    def pinned(self, role: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Page-locked host array, so uploads and downloads run asynchronously to the host"""
+        key = (role, shape)
+        buffer = self._pinned.get(key)
+        if buffer is None:
+            buffer = self._pinned[key] = np.empty(shape, dtype=np.uint8)
+            cv2.cuda.registerPageLocked(buffer)
+        return buffer
+    
+    def release(self):
+        """Unpin the host buffers"""
+        for buffer in self._pinned.values():
+            cv2.cuda.unregisterPageLocked(buffer)
+        self._pinned.clear()
 
 
 @dataclass
@@ -50,9 +303,26 @@ class VideoRenderer:
         self.render_progress = 0.0
         self.render_status = "idle"
         
+        # Vignette masks by (height, width, strength); they depend on nothing else
+        self._vignette_cache: Dict[Tuple[int, int, float], np.ndarray] = {}
+        
+        # Spatial effects run through OpenCV's CUDA module when a device is present;
+        # filter objects hold scratch buffers, so GPU work is serialized
+        self._cuda = _cuda_available()
+        self._cuda_filters: Dict[Tuple, Any] = {}
+        self._cuda_lock = threading.Lock()
+        if self._cuda:
+            # One stream for all GPU work; frames alternate between pipeline slots
+            self._cuda_stream = cv2.cuda_Stream()
+            self._cuda_slots = [_CudaSlot() for _ in range(CUDA_PIPELINE_DEPTH)]
+            self._cuda_next_slot = 0
+            logger.info("CUDA device found, offloading spatial effects to the GPU")
+        
         # Video processing tools
         self.ffmpeg_path = self._find_ffmpeg()
         self.blender_path = self._find_blender()
+        self.hw_encoder = self._find_hw_encoder()
+        self.ffmpeg_filters = _probe_filters(self.ffmpeg_path) if self.ffmpeg_path else frozenset()
         
         # Effects and transitions
         self._setup_effects_library()
@@ -61,29 +331,27 @@ class VideoRenderer:
     
     def _find_ffmpeg(self) -> Optional[str]:
         """Find FFmpeg installation"""
-        try:
-            result = subprocess.run(['which', 'ffmpeg'], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                logger.warning("FFmpeg not found in PATH")
-                return None
-        except Exception as e:
-            logger.warning(f"Failed to find FFmpeg: {e}")
+        path = _which('ffmpeg')
+        if path is None:
+            logger.warning("FFmpeg not found in PATH")
+        return path
+    
+    def _find_hw_encoder(self) -> Optional[str]:
+        """Hardware H.264 encoder to use instead of libx264, if enabled and available"""
+        if not (self.ffmpeg_path and self.config.hardware_encoding and self.config.codec in ("h264", "libx264")):
             return None
+        
+        encoder = _probe_hw_encoder(self.ffmpeg_path)
+        if encoder:
+            logger.info(f"Using hardware encoder {encoder}")
+        return encoder
     
     def _find_blender(self) -> Optional[str]:
         """Find Blender installation"""
-        try:
-            result = subprocess.run(['which', 'blender'], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                logger.warning("Blender not found in PATH")
-                return None
-        except Exception as e:
-            logger.warning(f"Failed to find Blender: {e}")
-            return None
+        path = _which('blender')
+        if path is None:
+            logger.warning("Blender not found in PATH")
+        return path
     
     def _setup_effects_library(self):
         """Setup video effects library"""
@@ -109,7 +377,15 @@ class VideoRenderer:
     
     def render_from_blender(self, blend_file: str, audio_file: str, output_path: str, 
                           effects: Optional[List[Dict[str, Any]]] = None) -> str:
-        """Render video from Blender animation file"""
+        """Render video from Blender animation file (blocking; see render_from_blender_async)"""
+        return _run_sync(self.render_from_blender_async(blend_file, audio_file, output_path, effects))
+    
+    async def render_from_blender_async(self, blend_file: str, audio_file: str, output_path: str,
+                                        effects: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Render video from Blender animation file
+        
+        Blender and FFmpeg run as asyncio subprocesses, so several jobs can share one event loop.
+        """
         try:
             self.render_status = "rendering"
             self.render_progress = 0.0
@@ -117,18 +393,21 @@ class VideoRenderer:
             logger.info(f"Starting Blender render: {blend_file}")
             
             # Create temporary directory for frames
-            frames_dir = self.temp_dir / "frames"
-            frames_dir.mkdir(exist_ok=True)
+            frames_dir = self._create_frames_dir()
             
-            # Render frames from Blender
-            self._render_blender_frames(blend_file, frames_dir)
-            
-            # Apply post-processing effects
-            if effects:
-                self._apply_post_effects(frames_dir, effects)
-            
-            # Combine frames with audio
-            final_video = self._combine_frames_and_audio(frames_dir, audio_file, output_path)
+            try:
+                # Render frames from Blender; each frame is consumed as soon as it is saved,
+                # so rendering, post-processing and encoding overlap
+                frame_files = self._render_blender_frames(blend_file, frames_dir)
+                
+                # Apply post-processing effects, streaming the processed frames into the encoder
+                frames = self._apply_post_effects(frame_files, effects) if effects else frame_files
+                
+                # Combine frames with audio
+                final_video = await self._combine_frames_and_audio(frames_dir, audio_file, output_path, frames)
+            finally:
+                # Frames may be in memory; release them as soon as the video is encoded
+                shutil.rmtree(frames_dir, ignore_errors=True)
             
             self.render_status = "completed"
             self.render_progress = 100.0
@@ -141,8 +420,18 @@ class VideoRenderer:
             logger.error(f"Render failed: {e}")
             raise
     
-    def _render_blender_frames(self, blend_file: str, output_dir: Path):
-        """Render frames from Blender file"""
+    def _create_frames_dir(self) -> Path:
+        """Fresh directory for rendered frames, on tmpfs when there is room so frames never touch the disk"""
+        frames_bytes = self.config.width * self.config.height * 3 * self.config.fps * SHM_MIN_SECONDS
+        try:
+            in_memory = shutil.disk_usage(SHM_DIR).free >= frames_bytes
+        except OSError:
+            in_memory = False
+        
+        return Path(tempfile.mkdtemp(prefix="frames_", dir=SHM_DIR if in_memory else self.temp_dir))
+    
+    async def _render_blender_frames(self, blend_file: str, output_dir: Path) -> AsyncIterator[Path]:
+        """Render frames from Blender file, yielding each frame file as soon as Blender has saved it"""
         if not self.blender_path:
             raise RuntimeError("Blender not found. Please install Blender.")
         
@@ -153,31 +442,48 @@ class VideoRenderer:
                 "--background",
                 blend_file,
                 "--render-output", str(output_dir / "frame_"),
-                "--render-format", "PNG",
+                "--render-format", FRAME_FORMAT,
                 "--render-anim"
             ]
             
             logger.info(f"Running Blender render: {' '.join(cmd)}")
             
-            # Run Blender with progress tracking
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+            # Run Blender, reading its log as it renders (stderr merged so neither pipe can fill up)
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
             )
             
-            # Monitor progress
-            self._monitor_blender_progress(process)
-            
-            # Wait for completion
-            process.wait()
+            output_tail = deque(maxlen=50)
+            yielded = set()
+            try:
+                async for raw_line in process.stdout:
+                    line = raw_line.decode(errors="replace")
+                    output_tail.append(line)
+                    self._update_blender_progress(line)
+                    
+                    saved = _BLENDER_SAVED_RE.search(line)
+                    if saved:
+                        frame_file = Path(saved.group(1))
+                        yielded.add(frame_file)
+                        yield frame_file
+                
+                # Wait for completion
+                await process.wait()
+            finally:
+                # The consumer stopped early (e.g. the encoder failed)
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
             
             if process.returncode != 0:
-                stderr = process.stderr.read()
-                raise RuntimeError(f"Blender render failed: {stderr}")
+                raise RuntimeError(f"Blender render failed: {''.join(output_tail)}")
+            
+            # Frames whose save message was not recognized
+            for frame_file in sorted(output_dir.glob(f"*.{FRAME_EXTENSION}")):
+                if frame_file not in yielded:
+                    yield frame_file
             
             logger.info("Blender frames rendered successfully")
             
@@ -185,80 +491,181 @@ class VideoRenderer:
             logger.error(f"Failed to render Blender frames: {e}")
             raise
     
-    def _monitor_blender_progress(self, process):
-        """Monitor Blender render progress"""
-        def read_output():
-            while True:
-                line = process.stdout.readline()
-                if not line:
-                    break
+    def _update_blender_progress(self, line: str):
+        """Update render progress from a line of Blender output"""
+        # Parse Blender output for progress ("Fra:12 Mem:..." as well as "Fra: 12")
+        frame_match = _BLENDER_FRAME_RE.search(line)
+        if frame_match:
+            frame_num = int(frame_match.group(1))
+            # Estimate progress (assuming 0-50% for Blender render); stages overlap, so never go back
+            self.render_progress = max(self.render_progress, min(50.0, frame_num / 100.0 * 50.0))
+    
+    async def _apply_post_effects(self, frame_files: AsyncIterator[Path],
+                                  effects: List[Dict[str, Any]]) -> AsyncIterator[np.ndarray]:
+        """Apply post-processing effects to frame files as they arrive, yielding them in (N, H, W, 3) batches
+        
+        The batches live in reused buffers: each is only valid until the next one is requested.
+        """
+        logger.info(f"Applying {len(effects)} effects to rendered frames")
+        loop = asyncio.get_running_loop()
+        
+        stages = None
+        buffers = None
+        processed = 0
+        
+        # Frame decoding and the OpenCV filters release the GIL, so per-frame work runs on a thread pool
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            def load_batch(paths: List[Path]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+                nonlocal stages, buffers
+                
+                # Load a batch of frames into one (N, H, W, 3) array
+                loaded = [frame for frame in pool.map(cv2.imread, map(str, paths)) if frame is not None]
+                
+                # Loaded frames are not needed on disk (or in tmpfs) any more
+                for path in paths:
+                    path.unlink(missing_ok=True)
+                if not loaded:
+                    return None
+                if buffers is None:
+                    # Two batch buffers, allocated once: each stage reads one and writes the other
+                    buffers = [np.empty((POST_EFFECT_BATCH_SIZE,) + loaded[0].shape, dtype=np.uint8) for _ in range(2)]
+                    stages = self._plan_post_effects(effects, loaded[0].shape[:2])
+                batch, spare = (buffer[:len(loaded)] for buffer in buffers)
+                np.stack(loaded, out=batch)
+                return batch, spare
+            
+            def run_stage(stage: Tuple, batch: np.ndarray, spare: np.ndarray):
+                if stage[0] == "batch":
+                    self._into(stage[1](batch, stage[2], out=spare), spare)
+                    return
+                apply_effect, params = stage[1:]
+                def apply_to_frame(j):
+                    dst = spare[j]
+                    self._into(apply_effect(batch[j], params, out=dst), dst)
+                list(pool.map(apply_to_frame, range(len(batch))))
+            
+            async for paths in _abatched(frame_files, POST_EFFECT_BATCH_SIZE):
+                # Batches are processed off the event loop, which keeps reading Blender's output meanwhile
+                buffered = await loop.run_in_executor(None, load_batch, paths)
+                if buffered is None:
+                    continue
+                batch, spare = buffered
                 
-                # Parse Blender output for progress
-                if "Fra:" in line:
-                    try:
-                        # Extract frame number
-                        parts = line.split()
-                        frame_idx = parts.index("Fra:") + 1
-                        if frame_idx < len(parts):
-                            frame_num = int(parts[frame_idx])
-                            # Estimate progress (assuming 0-50% for Blender render)
-                            self.render_progress = min(50.0, frame_num / 100.0 * 50.0)
-                    except (ValueError, IndexError):
-                        pass
-        
-        # Start monitoring thread
-        monitor_thread = threading.Thread(target=read_output)
-        monitor_thread.daemon = True
-        monitor_thread.start()
-    
-    def _apply_post_effects(self, frames_dir: Path, effects: List[Dict[str, Any]]):
-        """Apply post-processing effects to rendered frames"""
-        frame_files = sorted(list(frames_dir.glob("*.png")))
-        
-        if not frame_files:
+                # Apply effects in order: fused and per-pixel stages over the whole batch, spatial ones per frame
+                for stage in stages:
+                    if stage[0] == "fused":
+                        await loop.run_in_executor(_FUSED_EFFECTS_THREAD, _fused_pixel_effects, batch, *stage[1:])
+                        continue
+                    await loop.run_in_executor(None, run_stage, stage, batch, spare)
+                    batch, spare = spare, batch
+                
+                # Hand processed frames straight to the encoder instead of rewriting them
+                processed += len(batch)
+                yield batch
+        
+        if not processed:
             logger.warning("No frames found for post-processing")
-            return
+    
+    def _plan_post_effects(self, effects: List[Dict[str, Any]], frame_size: Tuple[int, int]) -> List[Tuple]:
+        """Effect chain as stages; with numba, runs of per-pixel effects collapse into one fused-kernel stage"""
+        h, w = frame_size
+        stages = []
+        steps = []
         
-        logger.info(f"Applying effects to {len(frame_files)} frames")
+        def flush_steps():
+            if not steps:
+                return
+            masks = [mask for _, _, _, mask in steps if mask is not None]
+            mask_ids = np.cumsum([mask is not None for _, _, _, mask in steps]) - 1
+            stages.append((
+                "fused",
+                np.array([kind for kind, _, _, _ in steps], dtype=np.int64),
+                np.array([gain for _, gain, _, _ in steps], dtype=np.float32),
+                np.array([bias for _, _, bias, _ in steps], dtype=np.float32),
+                mask_ids.astype(np.int64),
+                np.stack(masks).astype(np.float32) if masks else np.ones((1, 1, 1), dtype=np.float32)
+            ))
+            steps.clear()
         
-        for i, frame_file in enumerate(frame_files):
-            # Load frame
-            frame = cv2.imread(str(frame_file))
-            if frame is None:
+        for effect in effects:
+            effect_type = effect.get('type')
+            if effect_type not in self.effects:
+                continue
+            params = effect.get('params', {})
+            step = self._fused_step(effect_type, params, h, w) if NUMBA_AVAILABLE else None
+            if step is not None:
+                steps.append(step)
                 continue
             
-            # Apply effects
-            for effect in effects:
-                effect_type = effect.get('type')
-                if effect_type in self.effects:
-                    frame = self.effects[effect_type](frame, effect.get('params', {}))
-            
-            # Save processed frame
-            cv2.imwrite(str(frame_file), frame)
-            
-            # Update progress (50-80% for effects)
-            self.render_progress = 50.0 + (i / len(frame_files)) * 30.0
+            flush_steps()
+            stage_kind = "batch" if effect_type in BATCHED_EFFECTS else "frame"
+            stages.append((stage_kind, self.effects[effect_type], params))
+        
+        flush_steps()
+        return stages
+    
+    def _fused_step(self, effect_type: str, params: Dict[str, Any], h: int, w: int) -> Optional[Tuple]:
+        """(kind, gain, bias, mask) kernel step for a per-pixel effect, or None if it cannot be fused"""
+        if effect_type == 'fade_in':
+            return STEP_SCALE_ABS, params.get('alpha', 0.5), 0.0, None
+        if effect_type == 'fade_out':
+            return STEP_SCALE_ABS, 1.0 - params.get('alpha', 0.5), 0.0, None
+        if effect_type == 'color_correction' and params.get('saturation', 1.0) == 1.0:
+            # Saturation needs an HSV round trip, so only brightness/contrast fuse
+            return STEP_SCALE_ABS, params.get('contrast', 1.0), params.get('brightness', 0), None
+        if effect_type == 'vignette':
+            return STEP_MASK, 1.0, 0.0, self._vignette_mask(h, w, params.get('strength', 0.5))
+        return None
     
-    def _combine_frames_and_audio(self, frames_dir: Path, audio_file: str, output_path: str) -> str:
-        """Combine rendered frames with audio using FFmpeg"""
+    async def _combine_frames_and_audio(self, frames_dir: Path, audio_file: str, output_path: str,
+                                        frames: Optional[AsyncIterator[Union[np.ndarray, Path]]] = None) -> str:
+        """Combine rendered frames with audio using FFmpeg
+        
+        With frames given, they are piped to FFmpeg while they are produced: (N, H, W, 3) BGR
+        batches as raw video, frame file paths as an image stream. Otherwise the frame files
+        in frames_dir are read.
+        """
         if not self.ffmpeg_path:
             raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
         
         try:
-            frame_pattern = str(frames_dir / "frame_%04d.png")
+            first = None
+            if frames is not None:
+                try:
+                    first = await frames.__anext__()
+                except StopAsyncIteration:
+                    pass
+            if isinstance(first, np.ndarray):
+                h, w = first.shape[1:3]
+                video_input = [
+                    "-f", "rawvideo",
+                    "-pix_fmt", "bgr24",
+                    "-s", f"{w}x{h}",
+                    "-framerate", str(self.config.fps),
+                    "-i", "pipe:0"
+                ]
+            elif first is not None:
+                video_input = [
+                    "-f", "image2pipe",
+                    "-c:v", FRAME_EXTENSION,
+                    "-framerate", str(self.config.fps),
+                    "-i", "pipe:0"
+                ]
+            else:
+                frame_pattern = str(frames_dir / f"frame_%04d.{FRAME_EXTENSION}")
+                video_input = ["-framerate", str(self.config.fps), "-i", frame_pattern]
             
             # FFmpeg command to combine frames and audio
             cmd = [
                 self.ffmpeg_path,
                 "-y",  # Overwrite output
-                "-framerate", str(self.config.fps),
-                "-i", frame_pattern,
+                *FFMPEG_PROGRESS_ARGS,
+                *_hw_device_args(self.hw_encoder),
+                *video_input,
                 "-i", audio_file,
-                "-c:v", self.config.codec,
-                "-b:v", self.config.bitrate,
+                *self._video_encoder_args(),
                 "-c:a", "aac",
                 "-b:a", "128k",
-                "-pix_fmt", "yuv420p",
                 "-shortest",  # Match shortest stream
                 output_path
             ]
@@ -266,21 +673,37 @@ class VideoRenderer:
             logger.info(f"Running FFmpeg: {' '.join(cmd)}")
             
             # Run FFmpeg
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if first is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
             
-            # Monitor FFmpeg progress
-            self._monitor_ffmpeg_progress(process)
+            # Monitor FFmpeg progress; stderr only carries errors, so it is collected in full
+            progress = asyncio.create_task(self._read_ffmpeg_progress(process.stdout))
+            errors = asyncio.create_task(process.stderr.read())
+            
+            # Feed frames as they arrive
+            if first is not None:
+                try:
+                    await self._feed_frames(process.stdin, first, frames)
+                    process.stdin.close()
+                except (BrokenPipeError, ConnectionResetError):
+                    # FFmpeg exited early; its return code and stderr report why. Stop producing frames
+                    await frames.aclose()
+                except BaseException:
+                    # Rendering or post-processing failed mid-stream
+                    process.kill()
+                    await process.wait()
+                    raise
             
             # Wait for completion
-            process.wait()
+            stderr = (await errors).decode(errors="replace")
+            await process.wait()
+            await progress
             
             if process.returncode != 0:
-                stderr = process.stderr.read()
                 raise RuntimeError(f"FFmpeg failed: {stderr}")
             
             # Update progress to 100%
@@ -293,33 +716,115 @@ class VideoRenderer:
             logger.error(f"Failed to combine frames and audio: {e}")
             raise
     
-    def _monitor_ffmpeg_progress(self, process):
-        """Monitor FFmpeg progress"""
-        def read_output():
-            while True:
-                line = process.stderr.readline()
-                if not line:
-                    break
-                
-                # Parse FFmpeg output for progress
-                if "frame=" in line:
-                    try:
-                        # Extract frame number
-                        frame_part = line.split("frame=")[1].split()[0]
-                        frame_num = int(frame_part)
-                        # Estimate progress (80-100% for FFmpeg)
-                        self.render_progress = 80.0 + min(20.0, frame_num / 100.0 * 20.0)
-                    except (ValueError, IndexError):
-                        pass
-        
-        # Start monitoring thread
-        monitor_thread = threading.Thread(target=read_output)
-        monitor_thread.daemon = True
-        monitor_thread.start()
+    def _scale_filters(self, width: int, height: int, downscale: bool = False) -> Tuple[List[str], bool]:
+        """Fastest available scaling filter chain, and whether it leaves frames on the encoder's device"""
+        if self.hw_encoder == "h264_nvenc" and "scale_cuda" in self.ffmpeg_filters:
+            # Scale on the GPU and hand CUDA frames straight to NVENC
+            return ["format=yuv420p", "hwupload_cuda", f"scale_cuda={width}:{height}"], True
+        if self.hw_encoder == "h264_vaapi" and "scale_vaapi" in self.ffmpeg_filters:
+            return ["format=nv12", "hwupload", f"scale_vaapi=w={width}:h={height}"], True
+        if downscale:
+            # Shrinking needs no high-order resampler; swscale's fast bilinear path is cheapest
+            return [f"scale={width}:{height}:flags=fast_bilinear"], False
+        if "zscale" in self.ffmpeg_filters:
+            # zimg's SIMD resampler is much faster than swscale for large downscales; untagged
+            # stills are read as full-range BT.601 (the JPEG default) so zimg can find a path
+            return [
+                f"zscale=w={width}:h={height}:filter=spline36"
+                ":matrixin=470bg:rangein=full:matrix=709:range=limited"
+            ], False
+        return [f"scale={width}:{height}"], False
+    
+    def _video_encoder_args(self, filters: Optional[List[str]] = None, on_device: bool = False,
+                            still: bool = False) -> List[str]:
+        """FFmpeg video encoder, filter and pixel format options for the configured or hardware encoder
+        
+        on_device means the filters already deliver frames in the hardware encoder's memory; still
+        tunes x264 for a single repeated image.
+        """
+        if self.hw_encoder:
+            return _hw_encoder_args(self.hw_encoder, self.config.bitrate, filters, on_device)
+        
+        preset, tune = self.config.preset, self.config.tune
+        if still and self.config.codec in ("h264", "libx264"):
+            # Repeated frames are nearly free to code, so the fastest analysis loses little
+            preset, tune = "ultrafast", "stillimage"
+        args = [
+            "-c:v", self.config.codec,
+            "-b:v", self.config.bitrate,
+            "-preset", preset,
+            "-threads", str(self.config.threads)
+        ]
+        if tune:
+            args += ["-tune", tune]
+        if self.config.x264_params:
+            args += ["-x264-params", self.config.x264_params]
+        
+        if filters:
+            args += ["-vf", ",".join(filters)]
+        return args + ["-pix_fmt", "yuv420p"]
+    
+    async def _with_software_fallback(self, encode: Callable[[], Awaitable[str]]) -> str:
+        """Run an encode, and once more with the software encoder if the hardware encoder fails it
+        
+        The probe only shows that a tiny test encode works; an encoder that fails a real job is not
+        used again by this renderer.
+        """
+        hw_encoder = self.hw_encoder
+        try:
+            return await encode()
+        except RuntimeError as e:
+            if not hw_encoder:
+                raise
+            logger.warning(f"Hardware encoder {hw_encoder} failed, retrying with {self.config.codec}: {e}")
+            self.hw_encoder = None
+            return await encode()
+    
+    async def _feed_frames(self, stream: asyncio.StreamWriter, first: Union[np.ndarray, Path],
+                           frames: AsyncIterator[Union[np.ndarray, Path]]):
+        """Write frame batches or frame files to FFmpeg's stdin, waiting for the pipe to drain after each"""
+        async def items():
+            yield first
+            async for item in frames:
+                yield item
+        
+        async for item in items():
+            if isinstance(item, np.ndarray):
+                # Flat byte view: the transport keeps a copy of whatever it cannot write at once
+                stream.write(memoryview(np.ascontiguousarray(item)).cast("B"))
+            else:
+                stream.write(item.read_bytes())
+                item.unlink()
+            await stream.drain()
+    
+    async def _read_ffmpeg_progress(self, stream: asyncio.StreamReader, start: float = 80.0,
+                                    expected_frames: Optional[int] = None):
+        """Follow FFmpeg progress on its -progress stream, mapping it onto start-100%"""
+        async for line in stream:
+            if line.startswith(b"frame="):
+                try:
+                    frame_num = int(line[6:])
+                except ValueError:
+                    continue
+                # Estimate progress (100 frames when the total is unknown); stages overlap, so never go back
+                fraction = min(1.0, frame_num / (expected_frames or 100))
+                self.render_progress = max(self.render_progress, start + (100.0 - start) * fraction)
     
     def create_slideshow_video(self, images: List[str], audio_file: str, output_path: str,
                              duration_per_image: float = 3.0) -> str:
+        """Create a slideshow video from images (blocking; see create_slideshow_video_async)"""
+        return _run_sync(self.create_slideshow_video_async(images, audio_file, output_path, duration_per_image))
+    
+    async def create_slideshow_video_async(self, images: List[str], audio_file: str, output_path: str,
+                                           duration_per_image: float = 3.0) -> str:
         """Create a slideshow video from images"""
+        return await self._with_software_fallback(
+            lambda: self._create_slideshow_video(images, audio_file, output_path, duration_per_image)
+        )
+    
+    async def _create_slideshow_video(self, images: List[str], audio_file: str, output_path: str,
+                                      duration_per_image: float) -> str:
+        """Create a slideshow video from images with the current encoder"""
         try:
             self.render_status = "rendering"
             self.render_progress = 0.0
@@ -357,33 +862,50 @@ class VideoRenderer:
             with open(input_file, 'r') as f:
                 logger.debug(f"Input file content:\n{f.read()}")
             
-            # FFmpeg command for slideshow
+            # Only image headers are read to compare sizes
+            downscale = all(
+                w >= self.config.width and h >= self.config.height
+                for w, h in map(_image_size, images)
+            )
+            
+            # FFmpeg command for slideshow (scaling spread over all cores)
+            filter_threads = str(os.cpu_count() or 1)
             cmd = [
                 self.ffmpeg_path,
                 "-y",
+                *FFMPEG_PROGRESS_ARGS,
+                "-filter_threads", filter_threads,
+                "-filter_complex_threads", filter_threads,
+                *_hw_device_args(self.hw_encoder),
                 "-f", "concat",
                 "-safe", "0",
                 "-i", str(input_file),
                 "-i", audio_file,
-                "-c:v", self.config.codec,
-                "-b:v", self.config.bitrate,
+                *self._video_encoder_args(*self._scale_filters(self.config.width, self.config.height, downscale)),
                 "-c:a", "aac",
                 "-b:a", "128k",
-                "-pix_fmt", "yuv420p",
-                "-vf", f"scale={self.config.width}:{self.config.height}",
                 "-shortest",
                 output_path
             ]
             
             logger.info(f"Creating slideshow: {' '.join(cmd)}")
             
-            # Run FFmpeg
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Run FFmpeg, tracking progress over the expected frame count
+            process = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await asyncio.gather(
+                self._read_ffmpeg_progress(
+                    process.stdout, start=0.0, expected_frames=int(len(images) * duration_per_image * self.config.fps)
+                ),
+                process.stderr.read()
+            )
+            stderr = stderr.decode(errors="replace")
+            await process.wait()
             
-            if result.returncode != 0:
-                logger.error(f"FFmpeg stdout: {result.stdout}")
-                logger.error(f"FFmpeg stderr: {result.stderr}")
-                raise RuntimeError(f"FFmpeg slideshow failed: {result.stderr}")
+            if process.returncode != 0:
+                logger.error(f"FFmpeg stderr: {stderr}")
+                raise RuntimeError(f"FFmpeg slideshow failed: {stderr}")
             
             self.render_status = "completed"
             self.render_progress = 100.0
@@ -396,6 +918,155 @@ class VideoRenderer:
             logger.error(f"Slideshow creation failed: {e}")
             raise
     
+    def create_still_video(self, frame: np.ndarray, audio: Union[str, np.ndarray], output_path: str,
+                           duration: float, sample_rate: Optional[int] = None) -> str:
+        """Create a video showing one frame for the given duration (blocking; see create_still_video_async)"""
+        return _run_sync(self.create_still_video_async(frame, audio, output_path, duration, sample_rate))
+    
+    async def create_still_video_async(self, frame: np.ndarray, audio: Union[str, np.ndarray], output_path: str,
+                                       duration: float, sample_rate: Optional[int] = None) -> str:
+        """Create a video showing one BGR frame for the given duration
+        
+        The frame is piped to FFmpeg once as raw video and repeated there, at its own size. audio is
+        an audio file, or mono float samples at sample_rate, which are piped to FFmpeg on a second fd.
+        """
+        return await self._with_software_fallback(
+            lambda: self._create_still_video(frame, audio, output_path, duration, sample_rate)
+        )
+    
+    async def _create_still_video(self, frame: np.ndarray, audio: Union[str, np.ndarray], output_path: str,
+                                  duration: float, sample_rate: Optional[int]) -> str:
+        """Create a still video with the current encoder"""
+        audio_pipe = None
+        audio_temp = None
+        try:
+            self.render_status = "rendering"
+            self.render_progress = 0.0
+            
+            if not self.ffmpeg_path:
+                raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
+            
+            if isinstance(audio, np.ndarray):
+                samples = np.ascontiguousarray(audio, dtype=np.float32)
+                if os.name == "nt":
+                    # No fd inheritance on Windows; the samples go through a WAV file instead
+                    audio_temp = self._write_wav(samples, sample_rate)
+                    audio_input = ["-i", str(audio_temp)]
+                else:
+                    audio_pipe = os.pipe()
+                    audio_input = [
+                        "-f", "f32le",
+                        "-ar", str(sample_rate),
+                        "-ac", "1",
+                        "-i", f"pipe:{audio_pipe[0]}"
+                    ]
+            elif not os.path.exists(audio):
+                raise FileNotFoundError(f"Audio file not found: {audio}")
+            else:
+                audio_input = ["-i", audio]
+            
+            # The frame is converted to the encoder's input format once, ahead of the loop
+            h, w = frame.shape[:2]
+            pix_fmt = "nv12" if self.hw_encoder in ("h264_qsv", "h264_vaapi") else "yuv420p"
+            cmd = [
+                self.ffmpeg_path,
+                "-y",
+                *FFMPEG_PROGRESS_ARGS,
+                *_hw_device_args(self.hw_encoder),
+                "-f", "rawvideo",
+                "-pix_fmt", "bgr24",
+                "-s", f"{w}x{h}",
+                "-framerate", str(self.config.fps),
+                "-i", "pipe:0",
+                *audio_input,
+                *self._video_encoder_args([f"format={pix_fmt}", "loop=loop=-1:size=1"], still=True),
+                "-t", f"{duration:.3f}",
+                "-c:a", "aac",
+                "-b:a", "128k",
+                "-shortest",
+                output_path
+            ]
+            
+            logger.info(f"Creating still video: {' '.join(cmd)}")
+            
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                pass_fds=audio_pipe[:1] if audio_pipe else ()
+            )
+            if audio_pipe:
+                # FFmpeg holds the read end now; the samples are written from a worker thread
+                # while the frame goes to stdin
+                read_fd, write_fd = audio_pipe
+                audio_pipe = None
+                os.close(read_fd)
+                audio_writer = asyncio.get_running_loop().run_in_executor(None, self._write_pipe, write_fd, samples)
+            else:
+                audio_writer = None
+            
+            progress = asyncio.create_task(self._read_ffmpeg_progress(
+                process.stdout, start=0.0, expected_frames=int(duration * self.config.fps)
+            ))
+            errors = asyncio.create_task(process.stderr.read())
+            
+            try:
+                process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+                await process.stdin.drain()
+                process.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                # FFmpeg exited early; its return code and stderr report why
+                pass
+            
+            stderr = (await errors).decode(errors="replace")
+            await process.wait()
+            await progress
+            if audio_writer:
+                await audio_writer
+            
+            if process.returncode != 0:
+                logger.error(f"FFmpeg stderr: {stderr}")
+                raise RuntimeError(f"FFmpeg still video failed: {stderr}")
+            
+            self.render_status = "completed"
+            self.render_progress = 100.0
+            
+            logger.info(f"Still video created: {output_path}")
+            return output_path
+        
+        except Exception as e:
+            self.render_status = "failed"
+            logger.error(f"Still video creation failed: {e}")
+            raise
+        finally:
+            if audio_pipe:
+                for fd in audio_pipe:
+                    os.close(fd)
+            if audio_temp:
+                audio_temp.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _write_pipe(fd: int, data: np.ndarray):
+        """Write an array to a pipe in full and close it (blocking)"""
+        try:
+            with open(fd, "wb") as pipe:
+                pipe.write(memoryview(data).cast("B"))
+        except BrokenPipeError:
+            # FFmpeg exited early; its return code and stderr report why
+            pass
+    
+    def _write_wav(self, samples: np.ndarray, sample_rate: int) -> Path:
+        """Mono float samples as a 16-bit WAV file in the temp directory"""
+        fd, path = tempfile.mkstemp(prefix="audio_", suffix=".wav", dir=self.temp_dir)
+        os.close(fd)
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+        return Path(path)
+    
     def add_text_overlay(self, video_path: str, text_overlays: List[Dict[str, Any]], 
                         output_path: str) -> str:
         """Add text overlays to video"""
@@ -403,17 +1074,17 @@ class VideoRenderer:
             if not self.ffmpeg_path:
                 raise RuntimeError("FFmpeg not found. Please install FFmpeg.")
             
-            # Build filter complex for text overlays
-            filters = []
-            input_label = "0:v"
+            # Overlays that differ only in timing share one drawtext instance, and with it one font face
+            windows_by_style: Dict[Tuple, List[Tuple[float, float]]] = {}
             
-            for i, overlay in enumerate(text_overlays):
+            for overlay in text_overlays:
                 text = overlay.get('text', '')
                 start_time = overlay.get('start_time', 0)
                 duration = overlay.get('duration', 5)
                 font_size = overlay.get('font_size', 24)
                 color = overlay.get('color', 'white')
                 position = overlay.get('position', 'bottom')
+                fontfile = overlay.get('fontfile')  # Skips the fontconfig lookup for each drawtext
                 
                 # Position mapping
                 pos_map = {
@@ -428,22 +1099,37 @@ class VideoRenderer:
                 
                 xy = pos_map.get(position, '(w-text_w)/2:h-100')
                 
+                style = (text, font_size, color, xy, fontfile)
+                windows_by_style.setdefault(style, []).append((start_time, start_time + duration))
+            
+            # Build filter complex for text overlays
+            filters = []
+            input_label = "0:v"
+            
+            for i, ((text, font_size, color, xy, fontfile), windows) in enumerate(windows_by_style.items()):
+                x, y = xy.split(':', 1)
+                font = f"fontfile='{fontfile}':" if fontfile else ""
+                enable = "+".join(f"between(t,{start},{end})" for start, end in windows)
+                
                 # Create drawtext filter
-                filter_str = f"drawtext=text='{text}':fontsize={font_size}:fontcolor={color}:" \
-                           f"x={xy}:enable='between(t,{start_time},{start_time + duration})'"
+                filter_str = f"drawtext={font}text='{text}':fontsize={font_size}:fontcolor={color}:" \
+                           f"x={x}:y={y}:enable='{enable}'"
                 
                 output_label = f"overlay{i}"
                 filters.append(f"[{input_label}]{filter_str}[{output_label}]")
                 input_label = output_label
             
-            filter_complex = ";".join(filters)
+            # The graph goes through a script file, so any number of overlays fits a command line
+            script_fd, filter_script = tempfile.mkstemp(prefix="overlays_", suffix=".txt", dir=self.temp_dir)
+            with os.fdopen(script_fd, 'w') as f:
+                f.write(";\n".join(filters))
             
             # FFmpeg command with text overlays
             cmd = [
                 self.ffmpeg_path,
                 "-y",
                 "-i", video_path,
-                "-filter_complex", filter_complex,
+                "-filter_complex_script", filter_script,
                 "-map", f"[{input_label}]",
                 "-map", "0:a",
                 "-c:a", "copy",
@@ -452,7 +1138,10 @@ class VideoRenderer:
             
             logger.info(f"Adding text overlays: {' '.join(cmd)}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+            finally:
+                os.unlink(filter_script)
             
             if result.returncode != 0:
                 raise RuntimeError(f"Text overlay failed: {result.stderr}")
@@ -464,20 +1153,82 @@ class VideoRenderer:
             logger.error(f"Failed to add text overlays: {e}")
             raise
     
+    # GPU helpers (OpenCV CUDA module)
+    def _on_gpu(self, frame: np.ndarray, run, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Upload a frame, apply run(GpuMat, stream, scratch) -> GpuMat and download the result
+        
+        Work is queued asynchronously on the shared stream from pinned buffers, and only this
+        frame's slot is waited on; meanwhile other threads stage and queue frames in the other slots.
+        """
+        with self._cuda_lock:
+            slot = self._cuda_slots[self._cuda_next_slot]
+            self._cuda_next_slot = (self._cuda_next_slot + 1) % CUDA_PIPELINE_DEPTH
+        
+        with slot.lock:
+            staged = slot.pinned("in", frame.shape)
+            np.copyto(staged, frame)
+            
+            # Queue upload, kernels and download (filter objects are shared, so queueing is serialized)
+            with self._cuda_lock:
+                slot.gpu_frame.upload(staged, self._cuda_stream)
+                result = run(slot.gpu_frame, self._cuda_stream, slot.scratch)
+                width, height = result.size()
+                downloaded = slot.pinned("out", (height, width, result.channels()))
+                result.download(self._cuda_stream, downloaded)
+                slot.done.record(self._cuda_stream)
+            
+            slot.done.waitForCompletion()
+            if out is None:
+                return downloaded.copy()
+            np.copyto(out, downloaded)
+            return out
+    
+    def _cuda_filter(self, key: Tuple, create) -> Any:
+        """cv2.cuda filter object, created once per parameter set"""
+        gpu_filter = self._cuda_filters.get(key)
+        if gpu_filter is None:
+            gpu_filter = self._cuda_filters[key] = create()
+        return gpu_filter
+    
+    def _cuda_filter_bgr(self, frame: np.ndarray, gpu_filter: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply a cv2.cuda filter to a BGR frame (the CUDA filters take 4-channel input)"""
+        def run(gpu_frame, stream, scratch):
+            bgra = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2BGRA, dst=scratch(0), stream=stream)
+            filtered = gpu_filter.apply(bgra, dst=scratch(1), stream=stream)
+            return cv2.cuda.cvtColor(filtered, cv2.COLOR_BGRA2BGR, dst=scratch(2), stream=stream)
+        return self._on_gpu(frame, run, out)
+    
+    @staticmethod
+    def _into(result: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Make sure an effect's result ends up in out (paths that cannot write there return a new array)"""
+        if result is not out:
+            np.copyto(out, result)
+        return out
+    
     # Effect implementation methods
-    def _apply_fade_in(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_fade_in(self, frame: np.ndarray, params: Dict[str, Any],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply fade in effect"""
         alpha = params.get('alpha', 0.5)
-        faded = frame.astype(np.float32) * alpha
-        return faded.astype(np.uint8)
+        # Saturating uint8 scale in OpenCV, no float32 copy of the frame
+        return self._scale_abs(frame, alpha, 0, out)
     
-    def _apply_fade_out(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_fade_out(self, frame: np.ndarray, params: Dict[str, Any],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply fade out effect"""
         alpha = params.get('alpha', 0.5)
-        faded = frame.astype(np.float32) * (1.0 - alpha)
-        return faded.astype(np.uint8)
+        return self._scale_abs(frame, 1.0 - alpha, 0, out)
     
-    def _apply_zoom_in(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    @staticmethod
+    def _scale_abs(frame: np.ndarray, alpha: float, beta: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """cv2.convertScaleAbs over a frame or batch (per pixel, so batches go through as one tall image)"""
+        if out is None:
+            return cv2.convertScaleAbs(_as_image(frame), alpha=alpha, beta=beta).reshape(frame.shape)
+        cv2.convertScaleAbs(_as_image(frame), dst=_as_image(out), alpha=alpha, beta=beta)
+        return out
+    
+    def _apply_zoom_in(self, frame: np.ndarray, params: Dict[str, Any],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply zoom in effect"""
         zoom_factor = params.get('zoom_factor', 1.2)
         h, w = frame.shape[:2]
@@ -489,21 +1240,40 @@ class VideoRenderer:
         
         # Crop and resize
         cropped = frame[y_start:y_start + new_h, x_start:x_start + new_w]
-        zoomed = cv2.resize(cropped, (w, h))
+        if self._cuda:
+            return self._on_gpu(
+                cropped,
+                lambda gpu_frame, stream, scratch: cv2.cuda.resize(gpu_frame, (w, h), dst=scratch(0), stream=stream),
+                out
+            )
+        zoomed = cv2.resize(cropped, (w, h), dst=out)
         
         return zoomed
     
-    def _apply_zoom_out(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_zoom_out(self, frame: np.ndarray, params: Dict[str, Any],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply zoom out effect"""
         zoom_factor = params.get('zoom_factor', 0.8)
         h, w = frame.shape[:2]
         
         # Resize smaller
         new_h, new_w = int(h * zoom_factor), int(w * zoom_factor)
-        resized = cv2.resize(frame, (new_w, new_h))
+        if self._cuda:
+            resized = self._on_gpu(
+                frame,
+                lambda gpu_frame, stream, scratch: cv2.cuda.resize(
+                    gpu_frame, (new_w, new_h), dst=scratch(0), stream=stream
+                )
+            )
+        else:
+            resized = cv2.resize(frame, (new_w, new_h))
         
         # Create black background
-        result = np.zeros_like(frame)
+        if out is None:
+            result = np.zeros_like(frame)
+        else:
+            result = out
+            result.fill(0)
         
         # Center the resized frame
         y_start = (h - new_h) // 2
@@ -512,71 +1282,125 @@ class VideoRenderer:
         
         return result
     
-    def _apply_pan_left(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_pan_left(self, frame: np.ndarray, params: Dict[str, Any],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply pan left effect"""
         offset = params.get('offset', 50)
         h, w = frame.shape[:2]
         
-        # Create transformation matrix
+        if float(offset).is_integer():
+            # Whole-pixel pan: copy the overlapping columns, no interpolation needed
+            return _shift_columns(frame, -int(offset), out)
+        
+        # Create transformation matrix (sub-pixel offsets are interpolated)
         M = np.float32([[1, 0, -offset], [0, 1, 0]])
-        panned = cv2.warpAffine(frame, M, (w, h))
+        if self._cuda:
+            return self._on_gpu(
+                frame,
+                lambda gpu_frame, stream, scratch: cv2.cuda.warpAffine(gpu_frame, M, (w, h), dst=scratch(0), stream=stream),
+                out
+            )
+        panned = cv2.warpAffine(frame, M, (w, h), dst=out)
         
         return panned
     
-    def _apply_pan_right(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_pan_right(self, frame: np.ndarray, params: Dict[str, Any],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply pan right effect"""
         offset = params.get('offset', 50)
         h, w = frame.shape[:2]
         
-        # Create transformation matrix
+        if float(offset).is_integer():
+            # Whole-pixel pan: copy the overlapping columns, no interpolation needed
+            return _shift_columns(frame, int(offset), out)
+        
+        # Create transformation matrix (sub-pixel offsets are interpolated)
         M = np.float32([[1, 0, offset], [0, 1, 0]])
-        panned = cv2.warpAffine(frame, M, (w, h))
+        if self._cuda:
+            return self._on_gpu(
+                frame,
+                lambda gpu_frame, stream, scratch: cv2.cuda.warpAffine(gpu_frame, M, (w, h), dst=scratch(0), stream=stream),
+                out
+            )
+        panned = cv2.warpAffine(frame, M, (w, h), dst=out)
         
         return panned
     
-    def _apply_blur(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_blur(self, frame: np.ndarray, params: Dict[str, Any],
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply blur effect"""
         kernel_size = params.get('kernel_size', 15)
         if kernel_size % 2 == 0:
             kernel_size += 1  # Ensure odd number
         
-        blurred = cv2.GaussianBlur(frame, (kernel_size, kernel_size), 0)
+        if self._cuda and kernel_size <= CUDA_MAX_KERNEL_SIZE:
+            gpu_blur = self._cuda_filter(
+                ('blur', kernel_size),
+                lambda: cv2.cuda.createGaussianFilter(cv2.CV_8UC4, cv2.CV_8UC4, (kernel_size, kernel_size), 0)
+            )
+            return self._cuda_filter_bgr(frame, gpu_blur, out)
+        
+        blurred = cv2.GaussianBlur(frame, (kernel_size, kernel_size), 0, dst=out)
         return blurred
     
-    def _apply_sharpen(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
-        """Apply sharpen effect"""
+    def _apply_sharpen(self, frame: np.ndarray, params: Dict[str, Any],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply sharpen effect (unsharp mask: frame + strength * (frame - blurred))"""
         strength = params.get('strength', 1.0)
         
-        # Sharpen kernel
-        kernel = np.array([[-1, -1, -1],
-                          [-1, 9, -1],
-                          [-1, -1, -1]]) * strength
+        if self._cuda:
+            gpu_blur = self._cuda_filter(
+                ('sharpen_blur',),
+                lambda: cv2.cuda.createGaussianFilter(cv2.CV_8UC4, cv2.CV_8UC4, (7, 7), 1.0)
+            )
+            def run(gpu_frame, stream, scratch):
+                bgra = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2BGRA, dst=scratch(0), stream=stream)
+                blurred = gpu_blur.apply(bgra, dst=scratch(1), stream=stream)
+                sharpened = cv2.cuda.addWeighted(bgra, 1.0 + strength, blurred, -strength, 0, dst=scratch(2), stream=stream)
+                return cv2.cuda.cvtColor(sharpened, cv2.COLOR_BGRA2BGR, dst=scratch(3), stream=stream)
+            return self._on_gpu(frame, run, out)
         
-        sharpened = cv2.filter2D(frame, -1, kernel)
+        # Separable Gaussian passes instead of a dense 3x3 kernel; the blur is staged in out
+        blurred = cv2.GaussianBlur(frame, (0, 0), sigmaX=1.0, dst=out)
+        sharpened = cv2.addWeighted(frame, 1.0 + strength, blurred, -strength, 0, dst=out)
         return sharpened
     
-    def _apply_color_correction(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_color_correction(self, frame: np.ndarray, params: Dict[str, Any],
+                                out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply color correction"""
         brightness = params.get('brightness', 0)
         contrast = params.get('contrast', 1.0)
         saturation = params.get('saturation', 1.0)
         
         # Apply brightness and contrast
-        corrected = cv2.convertScaleAbs(frame, alpha=contrast, beta=brightness)
+        corrected = self._scale_abs(frame, contrast, brightness, out)
         
-        # Apply saturation
+        # Apply saturation (scaling only the S channel, in uint8 with OpenCV's saturating arithmetic)
         if saturation != 1.0:
-            hsv = cv2.cvtColor(corrected, cv2.COLOR_BGR2HSV).astype(np.float32)
-            hsv[:, :, 1] *= saturation
-            hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
-            corrected = cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+            hsv = cv2.cvtColor(_as_image(corrected), cv2.COLOR_BGR2HSV)
+            hsv[:, :, 1] = cv2.convertScaleAbs(hsv[:, :, 1], alpha=max(saturation, 0.0))
+            cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=_as_image(corrected))
         
         return corrected
     
-    def _apply_vignette(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    def _apply_vignette(self, frame: np.ndarray, params: Dict[str, Any],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
         """Apply vignette effect"""
         strength = params.get('strength', 0.5)
-        h, w = frame.shape[:2]
+        h, w = frame.shape[-3:-1]
+        vignette = self._vignette_mask(h, w, strength)
+        
+        # Apply vignette (broadcast over channels and, for batches, frames), truncating back to uint8
+        if out is None:
+            return np.multiply(frame, vignette[:, :, np.newaxis], dtype=np.float32).astype(np.uint8)
+        return np.multiply(frame, vignette[:, :, np.newaxis], out=out, dtype=np.float32, casting='unsafe')
+    
+    def _vignette_mask(self, h: int, w: int, strength: float) -> np.ndarray:
+        """Vignette attenuation per pixel (1 at the center), cached per frame size and strength"""
+        key = (h, w, strength)
+        mask = self._vignette_cache.get(key)
+        if mask is not None:
+            return mask
         
         # Create vignette mask
         center_x, center_y = w // 2, h // 2
@@ -590,22 +1414,17 @@ class VideoRenderer:
         
         # Create vignette
         vignette = 1 - (distance * strength)
-        vignette = np.clip(vignette, 0, 1)
-        
-        # Apply vignette
-        result = frame.astype(np.float32)
-        for i in range(frame.shape[2]):
-            result[:, :, i] *= vignette
-        
-        return result.astype(np.uint8)
+        mask = np.clip(vignette, 0, 1).astype(np.float32)
+        mask.flags.writeable = False
+        self._vignette_cache[key] = mask
+        return mask
     
     # Transition implementation methods
     def _transition_crossfade(self, frame1: np.ndarray, frame2: np.ndarray, 
                             progress: float) -> np.ndarray:
         """Crossfade transition"""
         alpha = progress
-        result = frame1.astype(np.float32) * (1 - alpha) + frame2.astype(np.float32) * alpha
-        return result.astype(np.uint8)
+        return cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0)
     
     def _transition_wipe(self, frame1: np.ndarray, frame2: np.ndarray, 
                        progress: float) -> np.ndarray:
@@ -613,10 +1432,8 @@ class VideoRenderer:
         h, w = frame1.shape[:2]
         split_x = int(w * progress)
         
-        result = frame1.copy()
-        result[:, :split_x] = frame2[:, :split_x]
-        
-        return result
+        # One copy per side instead of copying frame1 and overwriting part of it
+        return np.concatenate([frame2[:, :split_x], frame1[:, split_x:]], axis=1)
     
     def _transition_slide(self, frame1: np.ndarray, frame2: np.ndarray, 
                         progress: float) -> np.ndarray:
@@ -624,17 +1441,9 @@ class VideoRenderer:
         h, w = frame1.shape[:2]
         offset = int(w * progress)
         
-        result = np.zeros_like(frame1)
-        
-        # Slide frame1 out
-        if offset < w:
-            result[:, offset:] = frame1[:, :w-offset]
-        
-        # Slide frame2 in
-        if offset > 0:
-            result[:, :offset] = frame2[:, w-offset:]
-        
-        return result
+        # Frame2 slides in on the left while frame1 slides out to the right; the two
+        # parts cover the whole frame, so no zero-filled canvas is needed
+        return np.concatenate([frame2[:, w-offset:], frame1[:, :w-offset]], axis=1)
     
     def _transition_fade(self, frame1: np.ndarray, frame2: np.ndarray, 
                        progress: float) -> np.ndarray:
@@ -642,13 +1451,11 @@ class VideoRenderer:
         if progress < 0.5:
             # Fade out frame1
             alpha = 1 - (progress * 2)
-            result = frame1.astype(np.float32) * alpha
+            return cv2.convertScaleAbs(frame1, alpha=alpha)
         else:
             # Fade in frame2
             alpha = (progress - 0.5) * 2
-            result = frame2.astype(np.float32) * alpha
-        
-        return result.astype(np.uint8)
+            return cv2.convertScaleAbs(frame2, alpha=alpha)
     
     def get_render_progress(self) -> Tuple[float, str]:
         """Get current render progress"""
@@ -656,8 +1463,12 @@ class VideoRenderer:
     
     def cleanup(self):
         """Clean up temporary files"""
+        if self._cuda:
+            for slot in self._cuda_slots:
+                with slot.lock:
+                    slot.release()
+        
         try:
-            import shutil
             if self.temp_dir.exists():
                 shutil.rmtree(self.temp_dir)
                 logger.info("Temporary files cleaned up")
@@ -674,7 +1485,12 @@ def create_video_renderer(config: Dict[str, Any]) -> VideoRenderer:
         bitrate=config.get('bitrate', '5000k'),
         codec=config.get('codec', 'h264'),
         format=config.get('format', 'mp4'),
-        quality=config.get('quality', 'high')
+        quality=config.get('quality', 'high'),
+        preset=config.get('preset', 'veryfast'),
+        tune=config.get('tune'),
+        threads=config.get('threads', 0),
+        x264_params=config.get('x264_params', ''),
+        hardware_encoding=config.get('hardware_encoding', True)
     )
     
     return VideoRenderer(video_config)
@@ -8,35 +8,112 @@ import os
 from pathlib import Path
 import argparse
 import asyncio
+import functools
+import time
+from typing import Awaitable, Callable, Optional
 from loguru import logger
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import Settings
-from src.core.text_processor import TextProcessor
-from src.core.tts_engine import TTSEngine
-from src.core.video_renderer import create_video_renderer
+
+
+@functools.lru_cache(maxsize=None)
+def _wrap_kernel(compiled: bool = True):
+    """Line-wrapping kernel, built on first use so that numpy and numba load only when text is drawn
+    
+    It returns the index of the first word of each wrapped line (greedy, single spaces, at most
+    max_chars per line), compiled ahead of time or with numba when available. compiled=False gives
+    the plain Python kernel, which scripts/aot_compile.py compiles itself.
+    """
+    if compiled:
+        try:
+            # Built by scripts/aot_compile.py; loads without numba or JIT warm-up
+            from src.render_kernels import wrap_indices
+            return wrap_indices
+        except ImportError:
+            pass
+    import numpy as np
+    
+    def wrap_indices(word_lengths: np.ndarray, max_chars: int) -> np.ndarray:
+        starts = np.empty(word_lengths.shape[0], dtype=np.int32)
+        count = 0
+        line_length = 0
+        for i in range(word_lengths.shape[0]):
+            # A word that does not fit (or the very first word) starts a new line
+            if count == 0 or line_length + 1 + word_lengths[i] > max_chars:
+                starts[count] = i
+                count += 1
+                line_length = word_lengths[i]
+            else:
+                line_length += 1 + word_lengths[i]
+        return starts[:count]
+    
+    if not compiled:
+        return wrap_indices
+    try:
+        from numba import njit
+    except ImportError:
+        return wrap_indices
+    # Integer-only loop, compiled once and cached on disk
+    return njit(cache=True)(wrap_indices)
+
+
+@functools.lru_cache(maxsize=256)
+def _text_size(text: str, scale: float, thickness: int) -> tuple:
+    """Width and height of text in OpenCV's Hershey simplex font; fixed labels are measured once"""
+    import cv2
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0]
+
+
+def _cli_parser() -> argparse.ArgumentParser:
+    """Argument parser of the command-line interface"""
+    parser = argparse.ArgumentParser(
+        description="AI Text-to-Video Generation Platform"
+    )
+    parser.add_argument(
+        "text", 
+        help="Text to convert to video"
+    )
+    parser.add_argument(
+        "--language", "-l",
+        choices=["en", "hi"],
+        default="en",
+        help="Language for text-to-speech"
+    )
+    parser.add_argument(
+        "--aspect-ratio", "-ar",
+        choices=["16:9", "9:16", "1:1"],
+        default="16:9",
+        help="Video aspect ratio"
+    )
+    parser.add_argument(
+        "--quality", "-q",
+        choices=["720p", "1080p", "4k"],
+        default="1080p",
+        help="Output video quality"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Output file path"
+    )
+    parser.add_argument(
+        "--voice-style", "-vs",
+        default="default",
+        help="Voice style preference"
+    )
+    return parser
+
+
+async def _ignore_progress(percent: int, message: str):
+    """Default generate_video progress callback"""
 
 
 class TextToVideoApp:
     """Main application class for text-to-video generation"""
     
     def __init__(self):
-        self.settings = Settings()
-        self.text_processor = TextProcessor()
-        self.tts_engine = TTSEngine()
-        
-        # Initialize video renderer with default config
-        self.video_renderer = create_video_renderer({
-            'width': 1920,
-            'height': 1080,
-            'fps': 24,
-            'bitrate': '5000k',
-            'codec': 'h264'
-        })
-        
         # Setup logging
         logger.add(
             "logs/app.log",
@@ -44,6 +121,42 @@ class TextToVideoApp:
             retention="10 days",
             level="INFO"
         )
+        # Bound on concurrent renders, one per core. A thread-level limit rather than an asyncio one,
+        # since a shared app (Streamlit) serves each session from its own thread and event loop
+        from src.core.concurrency import ThreadLimit
+        self._render_slots = ThreadLimit(os.cpu_count() or 4, "render")
+    
+    # The engines pull in the ML and media stack, so each is imported and built on first use only
+    @functools.cached_property
+    def settings(self):
+        """Application settings"""
+        from config.settings import Settings
+        return Settings()
+    
+    @functools.cached_property
+    def text_processor(self):
+        """Text processing engine"""
+        from src.core.text_processor import TextProcessor
+        return TextProcessor()
+    
+    @functools.cached_property
+    def tts_engine(self):
+        """Text-to-speech engine"""
+        from src.core.tts_engine import TTSEngine
+        return TTSEngine()
+    
+    @functools.cached_property
+    def video_renderer(self):
+        """Video renderer with the default config"""
+        from src.core.video_renderer import create_video_renderer
+        
+        return create_video_renderer({
+            'width': 1920,
+            'height': 1080,
+            'fps': 24,
+            'bitrate': '5000k',
+            'codec': 'h264'
+        })
     
     async def generate_video(
         self,
@@ -52,7 +165,9 @@ class TextToVideoApp:
         voice_style: str = "default",
         aspect_ratio: str = "16:9",
         quality: str = "1080p",
-        output_path: str = None
+        output_path: str = None,
+        on_progress: Optional[Callable[[int, str], Awaitable[None]]] = None,
+        processed_text=None
     ) -> str:
         """
         Generate video from text input
@@ -64,38 +179,56 @@ class TextToVideoApp:
             aspect_ratio: Video aspect ratio (16:9, 9:16, 1:1)
             quality: Output quality (720p, 1080p, 4k)
             output_path: Custom output path
+            on_progress: Awaited with (percent, message) as each pipeline stage starts
+            processed_text: The text's ProcessedText, when the caller has already processed it
             
         Returns:
             Path to generated video file
         """
+        progress = on_progress or _ignore_progress
         try:
             logger.info(f"Starting video generation for text: {text[:50]}...")
             
             # Step 1: Process text
-            logger.info("Processing text input...")
-            processed_text = await self.text_processor.process_text(
-                text, language
-            )
-            
-            # Step 2: Generate audio with TTS
-            logger.info("Generating audio with TTS...")
-            audio_data = await self.tts_engine.generate_speech(
-                processed_text.cleaned_text, language, voice_style
-            )
+            if processed_text is None:
+                logger.info("Processing text input...")
+                await progress(10, "Processing text input...")
+                processed_text = await self.text_processor.process_text(
+                    text, language
+                )
             
-            # Step 3: Create character animations (placeholder)
-            logger.info("Creating character animations...")
-            # animation_data = await self.animation_engine.create_animations(
-            #     processed_text, audio_data
-            # )
-            
-            # Step 4: Render final video
-            logger.info("Rendering final video...")
-            
-            # Create a simple video with text overlay
-            video_path = await self._create_simple_video(
-                processed_text, audio_data, aspect_ratio, quality, output_path
-            )
+            # Steps 2-4 load the CPU, so only a bounded number of requests run them at once
+            # (a full limit is waited on off the event loop)
+            await self._render_slots.acquire()
+            try:
+                # Step 2: Generate audio with TTS, drawing the background on a worker thread meanwhile
+                # (OpenCV releases the GIL while it draws)
+                logger.info("Generating audio with TTS...")
+                await progress(25, "Generating audio with TTS...")
+                loop = asyncio.get_running_loop()
+                background, audio_data = await asyncio.gather(
+                    loop.run_in_executor(None, self._build_background, processed_text, aspect_ratio, quality),
+                    self.tts_engine.generate_speech(
+                        processed_text.cleaned_text, language, voice_style
+                    )
+                )
+                
+                # Step 3: Create character animations (placeholder)
+                logger.info("Creating character animations...")
+                # animation_data = await self.animation_engine.create_animations(
+                #     processed_text, audio_data
+                # )
+                
+                # Step 4: Render final video
+                logger.info("Rendering final video...")
+                await progress(70, "Rendering final video...")
+                
+                # Create a simple video with text overlay
+                video_path = await self._create_simple_video(
+                    processed_text, audio_data, background, output_path
+                )
+            finally:
+                self._render_slots.release()
             
             logger.success(f"Video generated successfully: {video_path}")
             return video_path
@@ -104,168 +237,116 @@ class TextToVideoApp:
             logger.error(f"Error generating video: {str(e)}")
             raise
     
+    def _build_background(
+        self,
+        processed_text,
+        aspect_ratio: str = "16:9",
+        quality: str = "1080p"
+    ):
+        """Draw the simple video's frame: gradient, title, wrapped text and text metadata (BGR array)"""
+        import cv2
+        import numpy as np
+        
+        # Set up video dimensions based on quality and aspect ratio, from the settings table
+        try:
+            width, height = self.settings.get_video_dimensions(quality, aspect_ratio)
+        except KeyError:
+            width, height = 1920, 1080
+        
+        # Create gradient background (dark blue to black): one colour per row, broadcast across the width
+        intensity = (100 * (1 - np.arange(height) / height)).astype(np.uint8)
+        row_colors = intensity[:, np.newaxis] + np.array([30, 20, 60], dtype=np.uint8)
+        background = np.broadcast_to(row_colors[:, np.newaxis, :], (height, width, 3)).copy()
+        
+        # Calculate font sizes based on resolution
+        title_font_scale = width / 1920 * 2.0
+        text_font_scale = width / 1920 * 0.8
+        
+        # Add title
+        title = "AI Text-to-Video Platform"
+        title_size = _text_size(title, title_font_scale, 3)
+        title_x = (width - title_size[0]) // 2
+        cv2.putText(background, title, (title_x, int(height * 0.1)), 
+                   cv2.FONT_HERSHEY_SIMPLEX, title_font_scale, (255, 255, 255), 3)
+        
+        # Add processed text with word wrapping
+        words = processed_text.cleaned_text.split()
+        max_chars_per_line = int(width / (text_font_scale * 20))  # Approximate character width
+        word_lengths = np.fromiter((len(word) for word in words), dtype=np.int32, count=len(words))
+        starts = _wrap_kernel()(word_lengths, max_chars_per_line).tolist()
+        
+        # Draw text lines; only the lines that fit are joined
+        y_start = int(height * 0.2)
+        line_height = int(text_font_scale * 40)
+        max_lines = min(len(starts), int((height * 0.6) / line_height))
+        lines = [" ".join(words[a:b]) for a, b in zip(starts[:max_lines], starts[1:] + [len(words)])]
+        
+        for i, line in enumerate(lines):
+            y_pos = y_start + (i * line_height)
+            cv2.putText(background, line, (50, y_pos), 
+                       cv2.FONT_HERSHEY_SIMPLEX, text_font_scale, (255, 255, 255), 2)
+        
+        # Add text metadata at bottom; the duration follows once the audio exists
+        self._draw_metadata(background, 0, f"Language: {processed_text.language.upper()}")
+        self._draw_metadata(background, 1, f"Words: {processed_text.metadata['word_count']}")
+        
+        return background
+    
+    @staticmethod
+    def _draw_metadata(background, column: int, info: str):
+        """Draw one metadata entry in its column along the bottom of the frame"""
+        import cv2
+        
+        height, width = background.shape[:2]
+        meta_font_scale = width / 1920 * 0.6
+        x_pos = 50 + (column * int(width / 3))
+        cv2.putText(background, info, (x_pos, int(height * 0.9)), 
+                   cv2.FONT_HERSHEY_SIMPLEX, meta_font_scale, (200, 200, 200), 2)
+    
     async def _create_simple_video(
         self, 
         processed_text, 
         audio_data: dict,
-        aspect_ratio: str = "16:9",
-        quality: str = "1080p",
+        background,
         output_path: str = None
     ) -> str:
-        """Create a simple video with text overlay"""
-        import tempfile
-        import cv2
-        import numpy as np
-        
+        """Create a simple video from the frame drawn by _build_background"""
         try:
-            # Save audio to temporary file
-            audio_path = f"data/output/temp_audio_{hash(processed_text.cleaned_text)}.wav"
-            await self.tts_engine.save_audio(audio_data, audio_path)
-            
-            # Set up video dimensions based on quality and aspect ratio
-            dimensions = {
-                "720p": {"16:9": (1280, 720), "9:16": (720, 1280), "1:1": (720, 720)},
-                "1080p": {"16:9": (1920, 1080), "9:16": (1080, 1920), "1:1": (1080, 1080)},
-                "4k": {"16:9": (3840, 2160), "9:16": (2160, 3840), "1:1": (2160, 2160)}
-            }
-            
-            width, height = dimensions.get(quality, {}).get(aspect_ratio, (1920, 1080))
-            
-            # Create background image with gradient
-            background = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            # Create gradient background (dark blue to black)
-            for i in range(height):
-                intensity = int(100 * (1 - i / height))
-                background[i, :] = [intensity + 30, intensity + 20, intensity + 60]
-            
-            # Calculate font sizes based on resolution
-            title_font_scale = width / 1920 * 2.0
-            text_font_scale = width / 1920 * 0.8
-            meta_font_scale = width / 1920 * 0.6
-            
-            # Add title
-            title = "AI Text-to-Video Platform"
-            title_size = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, title_font_scale, 3)[0]
-            title_x = (width - title_size[0]) // 2
-            cv2.putText(background, title, (title_x, int(height * 0.1)), 
-                       cv2.FONT_HERSHEY_SIMPLEX, title_font_scale, (255, 255, 255), 3)
-            
-            # Add processed text with word wrapping
-            words = processed_text.cleaned_text.split()
-            lines = []
-            max_chars_per_line = int(width / (text_font_scale * 20))  # Approximate character width
-            current_line = ""
-            
-            for word in words:
-                if len(current_line + " " + word) <= max_chars_per_line:
-                    current_line += " " + word if current_line else word
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-            
-            # Draw text lines
-            y_start = int(height * 0.2)
-            line_height = int(text_font_scale * 40)
-            max_lines = min(len(lines), int((height * 0.6) / line_height))
-            
-            for i, line in enumerate(lines[:max_lines]):
-                y_pos = y_start + (i * line_height)
-                cv2.putText(background, line, (50, y_pos), 
-                           cv2.FONT_HERSHEY_SIMPLEX, text_font_scale, (255, 255, 255), 2)
-            
-            # Add metadata at bottom
-            metadata_y = int(height * 0.9)
-            metadata_info = [
-                f"Language: {processed_text.language.upper()}",
-                f"Words: {processed_text.metadata['word_count']}",
-                f"Duration: {audio_data.duration:.1f}s"
-            ]
-            
-            for i, info in enumerate(metadata_info):
-                x_pos = 50 + (i * int(width / 3))
-                cv2.putText(background, info, (x_pos, metadata_y), 
-                           cv2.FONT_HERSHEY_SIMPLEX, meta_font_scale, (200, 200, 200), 2)
-            
-            # Save background image
-            bg_image_path = f"data/output/temp_bg_{hash(processed_text.cleaned_text)}.png"
-            os.makedirs("data/output", exist_ok=True)
-            
-            # Use absolute path for the background image
-            bg_image_path = os.path.abspath(bg_image_path)
-            cv2.imwrite(bg_image_path, background)
+            self._draw_metadata(background, 2, f"Duration: {audio_data.duration:.1f}s")
             
             # Generate output path if not provided
             if output_path is None:
-                timestamp = int(asyncio.get_event_loop().time())
-                output_path = f"data/output/video_{timestamp}.mp4"
+                # Wall-clock nanoseconds, so concurrent requests get distinct files
+                timestamp = time.time_ns()
+                output_path = str(self.settings.OUTPUT_DIR / f"video_{timestamp}.mp4")
             
-            # Create video using renderer
+            # Create video using renderer: the frame and the samples are piped to FFmpeg, no temporary files
             duration = audio_data.duration
-            video_file = self.video_renderer.create_slideshow_video(
-                images=[bg_image_path],
-                audio_file=audio_path,
+            video_file = await self.video_renderer.create_still_video_async(
+                frame=background,
+                audio=audio_data.audio_array,
                 output_path=output_path,
-                duration_per_image=duration
+                duration=duration,
+                sample_rate=audio_data.sample_rate
             )
             
-            # Clean up temporary files
-            try:
-                os.unlink(bg_image_path)
-                os.unlink(audio_path)
-            except:
-                pass
-            
             return video_file
             
         except Exception as e:
             logger.error(f"Failed to create simple video: {e}")
             raise
 
-    def run_cli(self):
+    def run_cli(self, args: argparse.Namespace = None):
         """Run the command-line interface"""
-        parser = argparse.ArgumentParser(
-            description="AI Text-to-Video Generation Platform"
-        )
-        parser.add_argument(
-            "text", 
-            help="Text to convert to video"
-        )
-        parser.add_argument(
-            "--language", "-l",
-            choices=["en", "hi"],
-            default="en",
-            help="Language for text-to-speech"
-        )
-        parser.add_argument(
-            "--aspect-ratio", "-ar",
-            choices=["16:9", "9:16", "1:1"],
-            default="16:9",
-            help="Video aspect ratio"
-        )
-        parser.add_argument(
-            "--quality", "-q",
-            choices=["720p", "1080p", "4k"],
-            default="1080p",
-            help="Output video quality"
-        )
-        parser.add_argument(
-            "--output", "-o",
-            help="Output file path"
-        )
-        parser.add_argument(
-            "--voice-style", "-vs",
-            default="default",
-            help="Voice style preference"
-        )
-        
-        args = parser.parse_args()
+        if args is None:
+            args = _cli_parser().parse_args()
         
-        # Generate video
-        video_path = asyncio.run(
+        # Generate video, on libuv's event loop when uvloop is installed
+        try:
+            from uvloop import run
+        except ImportError:
+            run = asyncio.run
+        video_path = run(
             self.generate_video(
                 text=args.text,
                 language=args.language,
@@ -278,44 +359,49 @@ class TextToVideoApp:
         
         print(f"✅ Audio generated successfully: {video_path}")
     
-    def run_web_interface(self):
+    @staticmethod
+    def run_web_interface():
         """Launch the web interface"""
         import subprocess
-        import sys
+        from config.settings import settings
+        
+        cmd = [
+            sys.executable, "-m", "streamlit", "run",
+            "src/web/streamlit_app.py",
+            f"--server.port={settings.WEB_PORT}",
+            f"--server.address={settings.WEB_HOST}"
+        ]
         
         logger.info("Starting web interface...")
+        if os.name != "nt":
+            # Become the Streamlit process rather than waiting on a child interpreter
+            os.execv(sys.executable, cmd)
         try:
-            subprocess.run([
-                sys.executable, "-m", "streamlit", "run",
-                "src/web/streamlit_app.py",
-                "--server.port=8501",
-                "--server.address=0.0.0.0"
-            ])
+            subprocess.run(cmd)
         except KeyboardInterrupt:
             logger.info("Web interface stopped by user")
     
-    def run_api_server(self):
+    @staticmethod
+    def run_api_server():
         """Launch the API server"""
-        import subprocess
-        import sys
+        import uvicorn
+        from config.settings import settings
         
         logger.info("Starting API server...")
         try:
-            subprocess.run([
-                sys.executable, "-m", "uvicorn",
+            # Served in this process; the reloader's watcher process only runs when API_RELOAD is set
+            uvicorn.run(
                 "src.api.routes:app",
-                "--host=0.0.0.0",
-                "--port=8000",
-                "--reload"
-            ])
+                host=settings.API_HOST,
+                port=settings.API_PORT,
+                reload=settings.API_RELOAD
+            )
         except KeyboardInterrupt:
             logger.info("API server stopped by user")
 
 
 def main():
     """Main entry point"""
-    app = TextToVideoApp()
-    
     if len(sys.argv) == 1:
         # No arguments provided, show help
         print("🎬 AI Text-to-Video Generation Platform")
@@ -328,12 +414,14 @@ def main():
         print("For more options: python src/main.py --help")
         return
     
+    # The launchers need no engines, and bad arguments or --help exit before any are loaded
     if "--web" in sys.argv:
-        app.run_web_interface()
+        TextToVideoApp.run_web_interface()
     elif "--api" in sys.argv:
-        app.run_api_server()
+        TextToVideoApp.run_api_server()
     else:
-        app.run_cli()
+        args = _cli_parser().parse_args()
+        TextToVideoApp().run_cli(args)
 
 
 if __name__ == "__main__":
@@ -6,20 +6,32 @@ import streamlit as st
 import asyncio
 import sys
 import os
+from collections import Counter
 from pathlib import Path
-import tempfile
 import time
-from typing import Optional
 
-# Add project root to path
+# Add project root to path (once: Streamlit re-executes this script on every rerun)
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-from src.core.text_processor import TextProcessor
-from src.core.tts_engine import TTSEngine
-from src.main import TextToVideoApp
 from config.settings import settings
 
+# Each generation runs to completion on its own event loop, libuv's when uvloop is installed
+try:
+    from uvloop import run as run_async
+except ImportError:
+    run_async = asyncio.run
+
+# Generated videos are reused for a week, and so kept on disk for as long
+_GENERATION_TTL = 7 * 24 * 3600
+# Regenerations of one input (its video deleted each time) before giving up
+_MAX_REVISIONS = 8
+
+# Fragments rerun on their own widgets' events only (st.fragment from Streamlit 1.37,
+# st.experimental_fragment from 1.33); older releases render the panel as part of the page
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
 
 # Page configuration
 st.set_page_config(
@@ -76,9 +88,30 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def get_app():
+    """One app (and its TTS and text-processing engines) shared by every session and rerun"""
+    # Imported here, so the Examples and Help pages never load the generation stack
+    from src.main import TextToVideoApp
+    return TextToVideoApp()
+
+
+@st.cache_data(ttl=300)
+def _cached_engines() -> list:
+    """Installed TTS engines, re-probed at most every five minutes rather than on every rerun"""
+    return get_app().tts_engine.get_available_engines()
+
+
+@st.cache_data(show_spinner=False, ttl=60, max_entries=2)
+def _read_bytes(path: str, mtime: float) -> bytes:
+    """A generated file's bytes for its download button, read once per (path, modification time)
+    
+    Videos can run to hundreds of MB, so only the last couple stay in memory, and only briefly.
+    """
+    return Path(path).read_bytes()
+
+
 # Initialize session state
-if 'app' not in st.session_state:
-    st.session_state.app = TextToVideoApp()
 if 'processing' not in st.session_state:
     st.session_state.processing = False
 if 'generated_video' not in st.session_state:
@@ -87,6 +120,7 @@ if 'generated_video' not in st.session_state:
 
 def main():
     """Main application interface"""
+    max_length = settings.MAX_TEXT_LENGTH
     
     # Header
     st.markdown("""
@@ -100,51 +134,55 @@ def main():
     with st.sidebar:
         st.header("⚙️ Settings")
         
-        # Language selection
-        language = st.selectbox(
-            "🌐 Language",
-            options=["en", "hi"],
-            format_func=lambda x: "English" if x == "en" else "Hindi",
-            help="Select the language for text-to-speech"
-        )
-        
-        # TTS Engine selection
-        available_engines = st.session_state.app.tts_engine.get_available_engines()
-        tts_engine = st.selectbox(
-            "🎤 TTS Engine",
-            options=available_engines,
-            help="Select the text-to-speech engine"
-        )
-        
-        # Voice style
-        voice_style = st.selectbox(
-            "🎵 Voice Style",
-            options=["default", "formal", "casual", "energetic"],
-            help="Select voice style preference"
-        )
-        
-        # Video settings
-        st.subheader("📹 Video Settings")
-        
-        aspect_ratio = st.selectbox(
-            "📐 Aspect Ratio",
-            options=["16:9", "9:16", "1:1"],
-            help="Select video aspect ratio"
-        )
-        
-        quality = st.selectbox(
-            "🎯 Quality",
-            options=["720p", "1080p", "4k"],
-            index=1,
-            help="Select output video quality"
-        )
-        
-        # Advanced settings
-        with st.expander("🔧 Advanced Settings"):
-            enable_animations = st.checkbox("Enable Character Animations", value=True)
-            enable_lip_sync = st.checkbox("Enable Lip Sync", value=True)
-            animation_intensity = st.slider("Animation Intensity", 0.1, 1.0, 0.8)
+        # Settings are batched in a form: changing them reruns nothing until they are applied
+        with st.form("settings"):
+            # Language selection
+            language = st.selectbox(
+                "🌐 Language",
+                options=["en", "hi"],
+                format_func=lambda x: "English" if x == "en" else "Hindi",
+                help="Select the language for text-to-speech"
+            )
+            
+            # TTS Engine selection
+            available_engines = _cached_engines()
+            tts_engine = st.selectbox(
+                "🎤 TTS Engine",
+                options=available_engines,
+                help="Select the text-to-speech engine"
+            )
+            
+            # Voice style
+            voice_style = st.selectbox(
+                "🎵 Voice Style",
+                options=["default", "formal", "casual", "energetic"],
+                help="Select voice style preference"
+            )
+            
+            # Video settings
+            st.subheader("📹 Video Settings")
             
+            aspect_ratio = st.selectbox(
+                "📐 Aspect Ratio",
+                options=["16:9", "9:16", "1:1"],
+                help="Select video aspect ratio"
+            )
+            
+            quality = st.selectbox(
+                "🎯 Quality",
+                options=["720p", "1080p", "4k"],
+                index=1,
+                help="Select output video quality"
+            )
+            
+            # Advanced settings
+            with st.expander("🔧 Advanced Settings"):
+                enable_animations = st.checkbox("Enable Character Animations", value=True)
+                enable_lip_sync = st.checkbox("Enable Lip Sync", value=True)
+                animation_intensity = st.slider("Animation Intensity", 0.1, 1.0, 0.8)
+            
+            st.form_submit_button("✅ Apply Settings")
+        
         # System info
         st.subheader("ℹ️ System Info")
         st.info(f"""
@@ -152,7 +190,7 @@ def main():
         
         **Supported Languages:** English, Hindi
         
-        **Max Text Length:** {settings.MAX_TEXT_LENGTH:,} characters
+        **Max Text Length:** {max_length:,} characters
         """)
     
     # Main content area
@@ -165,7 +203,8 @@ def main():
         input_method = st.radio(
             "Input Method",
             options=["Direct Text", "File Upload"],
-            horizontal=True
+            horizontal=True,
+            key="input_method"
         )
         
         text_input = ""
@@ -174,7 +213,8 @@ def main():
             text_input = st.text_area(
                 "Enter your text here:",
                 height=200,
-                max_chars=settings.MAX_TEXT_LENGTH,
+                max_chars=max_length,
+                key="text_input",
                 placeholder="Type or paste your text here. The AI will convert it into an engaging video with animated character..."
             )
         else:
@@ -187,19 +227,19 @@ def main():
             if uploaded_file:
                 try:
                     if uploaded_file.type == "text/plain":
-                        text_input = str(uploaded_file.read(), "utf-8")
+                        text_input = uploaded_file.getvalue().decode("utf-8")
                     else:
                         st.error("Only .txt files are supported in this demo")
                 except Exception as e:
                     st.error(f"Error reading file: {str(e)}")
-        
-        # Character count
-        if text_input:
-            char_count = len(text_input)
-            if char_count > settings.MAX_TEXT_LENGTH:
-                st.error(f"Text is too long ({char_count:,} characters). Maximum allowed: {settings.MAX_TEXT_LENGTH:,}")
-            else:
-                st.info(f"Character count: {char_count:,} / {settings.MAX_TEXT_LENGTH:,}")
+            
+            # Character count (the text area enforces and shows its own through max_chars)
+            if text_input:
+                char_count = len(text_input)
+                if char_count > max_length:
+                    st.error(f"Text is too long ({char_count:,} characters). Maximum allowed: {max_length:,}")
+                else:
+                    st.info(f"Character count: {char_count:,} / {max_length:,}")
         
         # Generate button
         if st.button("🎬 Generate Video", type="primary", disabled=st.session_state.processing):
@@ -219,6 +259,76 @@ def main():
             show_feature_preview()
 
 
+async def _generate(text: str, language: str, voice_style: str, aspect_ratio: str, quality: str, on_progress):
+    """Process the text (kept for the text analysis), then generate the video from it"""
+    app = get_app()
+    await on_progress(10, "Processing text input...")
+    processed_text = await app.text_processor.process_text(text, language)
+    video_path = await app.generate_video(
+        text=text,
+        language=language,
+        voice_style=voice_style,
+        aspect_ratio=aspect_ratio,
+        quality=quality,
+        output_path=str(_web_output_dir() / f"video_{time.time_ns()}.mp4"),
+        on_progress=on_progress,
+        processed_text=processed_text
+    )
+    return video_path, processed_text
+
+
+def _web_output_dir() -> Path:
+    """Directory of the videos made here, pruned of those older than any cache entry that could point at them"""
+    output_dir = settings.OUTPUT_DIR / "web"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cutoff = time.time() - _GENERATION_TTL
+    for video in output_dir.glob("video_*.mp4"):
+        try:
+            if video.stat().st_mtime < cutoff:
+                video.unlink()
+        except OSError:
+            pass
+    return output_dir
+
+
+# Held in memory: Streamlit ignores ttl for persist="disk" caches and never evicts their files
+@st.cache_data(show_spinner=False, ttl=_GENERATION_TTL, max_entries=64)
+def _generate_cached(text: str, language: str, voice_style: str, aspect_ratio: str, quality: str, revision: int):
+    """Video path and processed text per set of inputs, shared by every session"""
+    # The progress display is created in here, so a cache hit replays it finished
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    # The pipeline reports each stage as it starts
+    async def on_progress(percent: int, message: str):
+        progress_bar.progress(percent)
+        status_text.text(f"🎬 {message}")
+    
+    # The loop is closed even when generation fails
+    result = run_async(_generate(text, language, voice_style, aspect_ratio, quality, on_progress))
+    
+    progress_bar.progress(100)
+    status_text.text("✅ Video generation complete!")
+    return result
+
+
+def _generate_reusing(text: str, language: str, voice_style: str, aspect_ratio: str, quality: str):
+    """_generate_cached, regenerating when the cached entry's video has been deleted since"""
+    revision = 0
+    for _ in range(_MAX_REVISIONS):
+        video_path, processed_text = _generate_cached(text, language, voice_style, aspect_ratio, quality, revision)
+        if os.path.exists(video_path):
+            break
+        try:
+            # Evict only this stale entry, so the next call regenerates under the same key
+            _generate_cached.clear(text, language, voice_style, aspect_ratio, quality, revision)
+        except TypeError:
+            # Streamlit releases without per-key clearing: move to a fresh key instead, leaving the stale
+            # entry to expire with the TTL
+            revision += 1
+    return video_path, processed_text
+
+
 def generate_video(text: str, language: str, tts_engine: str, voice_style: str, aspect_ratio: str, quality: str):
     """Generate video from text input"""
     st.session_state.processing = True
@@ -226,35 +336,14 @@ def generate_video(text: str, language: str, tts_engine: str, voice_style: str,
     
     try:
         with st.spinner("🔄 Processing your request..."):
-            # Create progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Step 1: Generate video using the main app
-            status_text.text("🎬 Generating video...")
-            progress_bar.progress(10)
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Generate video with integrated pipeline
-            video_path = loop.run_until_complete(
-                st.session_state.app.generate_video(
-                    text=text,
-                    language=language,
-                    voice_style=voice_style,
-                    aspect_ratio=aspect_ratio,
-                    quality=quality
-                )
-            )
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Video generation complete!")
+            # Generate video with integrated pipeline, or reuse the video already made from these inputs
+            video_path, processed_text = _generate_reusing(text, language, voice_style, aspect_ratio, quality)
             
             # Store results
             st.session_state.generated_video = {
                 "video_path": video_path,
                 "text": text,
+                "processed_text": processed_text,
                 "settings": {
                     "language": language,
                     "tts_engine": tts_engine,
@@ -264,8 +353,6 @@ def generate_video(text: str, language: str, tts_engine: str, voice_style: str,
                 }
             }
             
-            loop.close()
-            
     except Exception as e:
         st.error(f"Error generating video: {str(e)}")
         st.exception(e)
@@ -283,6 +370,7 @@ def show_processing_status():
     """, unsafe_allow_html=True)
 
 
+@fragment
 def show_video_result():
     """Show generated video results"""
     result = st.session_state.generated_video
@@ -296,33 +384,31 @@ def show_video_result():
     # Video preview
     st.subheader("� Video Preview")
     if os.path.exists(result["video_path"]):
-        # Display video
+        # Display video; Streamlit serves it from the file, so no copy is kept in memory for it
         st.video(result["video_path"])
         
         # Download button for video
-        with open(result["video_path"], "rb") as video_file:
-            st.download_button(
-                label="📥 Download Video",
-                data=video_file.read(),
-                file_name=f"generated_video.mp4",
-                mime="video/mp4"
-            )
+        st.download_button(
+            label="📥 Download Video",
+            data=_read_bytes(result["video_path"], os.path.getmtime(result["video_path"])),
+            file_name=f"generated_video.mp4",
+            mime="video/mp4"
+        )
     else:
         st.warning("Video file not found. Only audio was generated.")
         
         # Check if it's actually an audio file
-        if result["video_path"].endswith(('.wav', '.mp3', '.ogg')):
+        if result["video_path"].endswith(('.wav', '.mp3', '.ogg')) and os.path.exists(result["video_path"]):
             st.subheader("🎤 Audio Preview")
             st.audio(result["video_path"])
             
             # Download button for audio
-            with open(result["video_path"], "rb") as audio_file:
-                st.download_button(
-                    label="📥 Download Audio",
-                    data=audio_file.read(),
-                    file_name=f"generated_audio.wav",
-                    mime="audio/wav"
-                )
+            st.download_button(
+                label="📥 Download Audio",
+                data=_read_bytes(result["video_path"], os.path.getmtime(result["video_path"])),
+                file_name=f"generated_audio.wav",
+                mime="audio/wav"
+            )
     
     # Generation info
     st.subheader("📊 Generation Info")
@@ -343,7 +429,7 @@ def show_video_result():
     # Generate new video button
     if st.button("🔄 Generate Another Video"):
         st.session_state.generated_video = None
-        st.experimental_rerun()
+        st.rerun()
     
     # Text analysis results
     st.subheader("📊 Text Analysis")
@@ -363,34 +449,16 @@ def show_video_result():
     # Emotion analysis
     if processed.emotion_cues:
         st.subheader("😊 Emotion Analysis")
-        emotions = {}
-        for cue in processed.emotion_cues:
-            emotion = cue["emotion"]
-            emotions[emotion] = emotions.get(emotion, 0) + 1
-        
-        for emotion, count in emotions.items():
+        emotions = Counter(cue["emotion"] for cue in processed.emotion_cues)
+        for emotion, count in emotions.most_common():
             st.write(f"• {emotion.title()}: {count} occurrences")
     
     # Animation cues
     if processed.animation_cues:
         st.subheader("🎭 Animation Cues")
-        animations = {}
-        for cue in processed.animation_cues:
-            anim_type = cue["animation_type"]
-            animations[anim_type] = animations.get(anim_type, 0) + 1
-        
-        for anim_type, count in animations.items():
+        animations = Counter(cue["animation_type"] for cue in processed.animation_cues)
+        for anim_type, count in animations.most_common():
             st.write(f"• {anim_type.title()}: {count} triggers")
-    
-    # Settings used
-    with st.expander("⚙️ Generation Settings"):
-        settings_used = result["settings"]
-        st.json(settings_used)
-    
-    # Generate new video button
-    if st.button("🔄 Generate Another Video"):
-        st.session_state.generated_video = None
-        st.experimental_rerun()
 
 
 def show_feature_preview():
@@ -417,6 +485,13 @@ def show_feature_preview():
     st.info("Generated video will appear here. Audio preview will be available immediately after TTS generation.")
 
 
+def use_example(text: str):
+    """Load an example into the text area and switch to the generator (runs before the next rerun)"""
+    st.session_state.text_input = text
+    st.session_state.input_method = "Direct Text"
+    st.session_state.page = "Generate Video"
+
+
 def show_examples():
     """Show example texts for different use cases"""
     st.header("💡 Example Texts")
@@ -431,8 +506,7 @@ def show_examples():
     for category, text in examples.items():
         with st.expander(f"📝 {category}"):
             st.write(text)
-            if st.button(f"Use {category} Example", key=f"example_{category}"):
-                st.session_state.example_text = text
+            st.button(f"Use {category} Example", key=f"example_{category}", on_click=use_example, args=(text,))
 
 
 # Sidebar navigation
@@ -442,7 +516,8 @@ with st.sidebar:
     page = st.selectbox(
         "📱 Navigation",
         options=["Generate Video", "Examples", "Help"],
-        index=0
+        index=0,
+        key="page"
     )
 
 # Main content routing